@@ -0,0 +1,47 @@
+# apps/api/alembic/env.py
+"""
+Alembic environment for CursorCode AI.
+Migrations run over the sync psycopg2 engine the Celery workers use
+(same DATABASE_URL and SSL settings, minus asyncpg).
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.models import Base
+from app.db.session import sync_engine
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout (alembic upgrade head --sql) instead of connecting."""
+    context.configure(
+        url=sync_engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with sync_engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
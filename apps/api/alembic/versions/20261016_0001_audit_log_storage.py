@@ -0,0 +1,257 @@
+"""audit log storage, app_errors table, plan SMALLINT key, admin indexes
+
+Brings a database created from the original models up to the current ones:
+- audit_logs: BIGINT identity id, event_id (unique, DB-generated default),
+  user_id, User-Agent dictionary (user_agents + user_agent_hash),
+  SMALLINT request_method
+- plans: SMALLINT identity id (UUIDMixin dropped; nothing references plans.id)
+- app_errors: monitoring sink (created only if missing — it predates the model)
+- users.name (if missing), admin dashboard indexes, TIMESTAMPTZ created_at/updated_at
+
+Surrogate ids are renumbered: audit_logs/plans ids were never exposed
+(plans are looked up by name / Stripe price id), so no mapping is kept.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import xxhash
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of the app constants: later model edits must not change this revision
+USER_AGENT_MAX_LENGTH = 512
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS", "TRACE", "CONNECT")
+TIMESTAMP_TABLES = ("orgs", "users", "plans", "projects", "audit_logs")
+
+
+def _hash_user_agent(user_agent: str) -> int:
+    """Same as app.db.models.audit.hash_user_agent."""
+    return xxhash.xxh64_intdigest(user_agent.encode()) & 0x7FFFFFFFFFFFFFFF
+
+
+def _naive_timestamp_columns(table: str) -> list:
+    inspector = sa.inspect(op.get_bind())
+    return [
+        col["name"]
+        for col in inspector.get_columns(table)
+        if col["name"] in ("created_at", "updated_at")
+        and isinstance(col["type"], sa.TIMESTAMP)
+        and not col["type"].timezone
+    ]
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(col["name"] == column for col in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")  # gen_random_uuid() before PG13
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")   # idx_users_email_trgm
+
+    # ────────────────────────────────────────────────
+    # TIMESTAMPTZ timestamps (stored values were UTC)
+    # ────────────────────────────────────────────────
+    for table in TIMESTAMP_TABLES:
+        for column in _naive_timestamp_columns(table):
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE TIMESTAMPTZ USING {column} AT TIME ZONE 'UTC'"
+            )
+
+    # ────────────────────────────────────────────────
+    # User-Agent dictionary
+    # ────────────────────────────────────────────────
+    op.create_table(
+        "user_agents",
+        sa.Column("hash", sa.BigInteger(), autoincrement=False, nullable=False,
+                  comment="hash_user_agent(user_agent)"),
+        sa.Column("user_agent", sa.String(length=USER_AGENT_MAX_LENGTH), nullable=False,
+                  comment="User-Agent header (truncated to USER_AGENT_MAX_LENGTH)"),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+
+    bind = op.get_bind()
+    user_agents = bind.execute(sa.text(
+        "SELECT DISTINCT left(user_agent, :n) FROM audit_logs "
+        "WHERE user_agent IS NOT NULL AND user_agent <> ''"
+    ), {"n": USER_AGENT_MAX_LENGTH}).scalars().all()
+    if user_agents:
+        op.bulk_insert(
+            sa.table("user_agents", sa.column("hash", sa.BigInteger), sa.column("user_agent", sa.String)),
+            [{"hash": _hash_user_agent(ua), "user_agent": ua} for ua in user_agents],
+        )
+
+    # ────────────────────────────────────────────────
+    # audit_logs
+    # ────────────────────────────────────────────────
+    # UUID id → BIGINT identity (dropping the column drops its PK and index)
+    op.drop_column("audit_logs", "id")
+    op.execute(
+        "ALTER TABLE audit_logs ADD COLUMN id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+    )
+    op.execute("COMMENT ON COLUMN audit_logs.id IS 'Sequential audit entry ID'")
+
+    op.add_column("audit_logs", sa.Column(
+        "user_id", postgresql.UUID(as_uuid=False), nullable=True,
+        comment="Acting user (null = system/anonymous)",
+    ))
+    op.create_foreign_key(
+        "audit_logs_user_id_fkey", "audit_logs", "users", ["user_id"], ["id"], ondelete="SET NULL"
+    )
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+
+    # Existing rows get a generated id too, so the merge's ON CONFLICT (event_id) has a unique index
+    op.add_column("audit_logs", sa.Column(
+        "event_id", postgresql.UUID(as_uuid=False), nullable=True,
+        server_default=sa.text("gen_random_uuid()"),
+        comment="Client-generated event ID for deduplication / correlation (DB-generated if omitted)",
+    ))
+    op.create_index("ix_audit_logs_event_id", "audit_logs", ["event_id"], unique=True)
+
+    op.add_column("audit_logs", sa.Column(
+        "user_agent_hash", sa.BigInteger(), nullable=True,
+        comment="User-Agent header, dictionary-encoded (FK-style ref to user_agents.hash)",
+    ))
+    op.execute(
+        "UPDATE audit_logs AS a SET user_agent_hash = u.hash FROM user_agents AS u "
+        f"WHERE left(a.user_agent, {USER_AGENT_MAX_LENGTH}) = u.user_agent"
+    )
+    op.create_index("ix_audit_logs_user_agent_hash", "audit_logs", ["user_agent_hash"])
+    op.drop_column("audit_logs", "user_agent")
+
+    # VARCHAR method → HttpMethod value (unknown verbs become NULL)
+    method_cases = " ".join(f"WHEN '{name}' THEN {value}" for value, name in enumerate(HTTP_METHODS, 1))
+    op.execute(
+        "ALTER TABLE audit_logs ALTER COLUMN request_method TYPE SMALLINT "
+        f"USING CASE upper(request_method) {method_cases} END"
+    )
+    op.execute(
+        "COMMENT ON COLUMN audit_logs.request_method IS "
+        "'HTTP method as HttpMethod enum value (1=GET, 2=POST, ...)'"
+    )
+
+    # ────────────────────────────────────────────────
+    # plans: UUID id → SMALLINT identity
+    # ────────────────────────────────────────────────
+    op.drop_column("plans", "id")
+    op.execute("ALTER TABLE plans ADD COLUMN id SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY")
+    op.execute("COMMENT ON COLUMN plans.id IS 'Internal surrogate key'")
+
+    # ────────────────────────────────────────────────
+    # app_errors (previously created by hand in Supabase)
+    # ────────────────────────────────────────────────
+    if not sa.inspect(op.get_bind()).has_table("app_errors"):
+        _create_app_errors()
+
+    # ────────────────────────────────────────────────
+    # users / projects
+    # ────────────────────────────────────────────────
+    if not _has_column("users", "name"):
+        op.add_column("users", sa.Column("name", sa.String(length=255), nullable=True))
+
+    # Live tables: build outside the migration transaction so writes aren't blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_users_created", "users", [sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_users_sub_plan", "users", ["subscription_status", "plan"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_users_email_trgm", "users", ["email"],
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_projects_status_created", "projects", ["status", sa.text("created_at DESC")],
+            postgresql_where=sa.text("status IN ('FAILED', 'BUILDING', 'COMPLETED')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def _create_app_errors() -> None:
+    op.create_table(
+        "app_errors",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("level", sa.String(length=32), nullable=False,
+                  comment="Source/severity (e.g. 'error', 'frontend_error', 'webhook_error')"),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("stack", sa.Text(), nullable=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column("request_path", sa.String(length=2048), nullable=True),
+        sa.Column("request_method", sa.String(length=16), nullable=True,
+                  comment="HTTP method, or 'CLIENT_SIDE' for frontend reports"),
+        sa.Column("environment", sa.String(length=20), nullable=True),
+        sa.Column("extra", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_app_errors_level", "app_errors", ["level"])
+    op.create_index("ix_app_errors_user_id", "app_errors", ["user_id"])
+    op.create_index("ix_app_errors_created_at", "app_errors", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_projects_status_created", table_name="projects")
+    op.drop_index("idx_users_email_trgm", table_name="users")
+    op.drop_index("idx_users_sub_plan", table_name="users")
+    op.drop_index("idx_users_created", table_name="users")
+    # users.name and app_errors are kept: either may predate this revision
+
+    op.drop_column("plans", "id")
+    op.add_column("plans", sa.Column(
+        "id", postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()"),
+    ))
+    op.create_primary_key("plans_pkey", "plans", ["id"])
+    op.create_index("ix_plans_id", "plans", ["id"])
+
+    method_cases = " ".join(f"WHEN {value} THEN '{name}'" for value, name in enumerate(HTTP_METHODS, 1))
+    op.execute(
+        "ALTER TABLE audit_logs ALTER COLUMN request_method TYPE VARCHAR(10) "
+        f"USING CASE request_method {method_cases} END"
+    )
+
+    op.add_column("audit_logs", sa.Column("user_agent", sa.Text(), nullable=True))
+    op.execute(
+        "UPDATE audit_logs AS a SET user_agent = u.user_agent FROM user_agents AS u "
+        "WHERE a.user_agent_hash = u.hash"
+    )
+    op.drop_index("ix_audit_logs_user_agent_hash", table_name="audit_logs")
+    op.drop_column("audit_logs", "user_agent_hash")
+    op.drop_index("ix_audit_logs_event_id", table_name="audit_logs")
+    op.drop_column("audit_logs", "event_id")
+    op.drop_index("ix_audit_logs_user_id", table_name="audit_logs")
+    op.drop_column("audit_logs", "user_id")  # drops audit_logs_user_id_fkey
+
+    op.drop_column("audit_logs", "id")
+    op.add_column("audit_logs", sa.Column(
+        "id", postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()"),
+    ))
+    op.create_primary_key("audit_logs_pkey", "audit_logs", ["id"])
+    op.create_index("ix_audit_logs_id", "audit_logs", ["id"])
+
+    op.drop_table("user_agents")
+
+    for table in TIMESTAMP_TABLES:
+        for column in ("created_at", "updated_at"):
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE TIMESTAMP USING {column} AT TIME ZONE 'UTC'"
+            )
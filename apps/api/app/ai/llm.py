@@ -129,7 +129,7 @@ def get_routed_llm(
     )
 
     # Audit
-    audit_log.delay(
+    audit_log(
         user_id=None,
         action="grok_llm_routed",
         metadata={
@@ -182,7 +182,7 @@ async def stream_routed_llm(
     )
 
     # Audit streaming call
-    audit_log.delay(
+    audit_log(
         user_id=None,
         action="grok_llm_stream_started",
         metadata={
@@ -145,7 +145,7 @@ async def agent_node(
         )
 
         # Audit
-        audit_log.delay(
+        audit_log(
             user_id=state.get("user_id"),
             action=f"agent_{agent_type}_executed",
             metadata={
@@ -80,7 +80,7 @@ def get_model_for_agent(
     selected = MODELS.get(preferred, DEFAULT_FALLBACK_MODEL)
 
     # Audit routing decision
-    audit_log.delay(
+    audit_log(
         user_id=None,  # Filled by caller context
         action="grok_model_routed",
         metadata={
@@ -8,8 +8,7 @@ Tools are called manually after LLM response parsing.
 
 import logging
 from typing import Literal, Dict, Any, List, Optional
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from datetime import datetime, timezone
 
 import httpx
 from pydantic import BaseModel, Field
@@ -60,13 +59,13 @@ class VulnerabilityScanResult(BaseModel):
 # ────────────────────────────────────────────────
 async def log_tool_usage(tool_name: str, args: Dict, result: Any, user_id: Optional[str] = None):
     """Audit tool usage (non-blocking)"""
-    await audit_log.delay(
+    audit_log(
         user_id=user_id,
         action=f"tool_used:{tool_name}",
         metadata={
             "args": args,
             "result_summary": str(result)[:500] + "..." if len(str(result)) > 500 else str(result),
-            "timestamp": datetime.now(ZoneInfo("UTC")).isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     )
 
@@ -0,0 +1,37 @@
+"""
+app/core/celery_app.py
+Celery application for CursorCode AI.
+Task modules declare @shared_task; creating this app makes it the current app, so
+those tasks publish to (and workers consume from) the Redis broker configured here.
+The API process imports it in main.py for the same reason.
+
+Workers:
+    celery -A app.core.celery_app worker -Q audit --prefetch-multiplier=0 -c 4
+    celery -A app.core.celery_app worker -Q emails -P gevent -c 500 --prefetch-multiplier=1
+    celery -A app.core.celery_app worker -Q celery
+"""
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "cursorcode",
+    broker=str(settings.REDIS_URL),
+    include=[
+        "app.services.logging",
+        "app.tasks.email",
+        "app.tasks.billing",
+        "app.tasks.metering",
+    ],
+)
+
+celery_app.conf.update(
+    # JSON stays the default; the audit and email tasks opt into msgpack per task
+    # (zstd-compressed for audit). Workers reject any content type not listed here
+    task_serializer="json",
+    accept_content=["json", "msgpack"],
+    result_accept_content=["json", "msgpack"],
+    timezone="UTC",
+    enable_utc=True,
+)
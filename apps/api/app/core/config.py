@@ -72,6 +72,38 @@ class Settings(BaseSettings):
     )
 
 
+    # ────────────────────────────────────────────────
+    # Monitoring
+    # ────────────────────────────────────────────────
+
+    PROMETHEUS_NATIVE_HISTOGRAMS: bool = Field(
+        default=False,
+        description="Use sparse exponential latency buckets (native-histogram layout)",
+    )
+
+
+    # ────────────────────────────────────────────────
+    # Audit
+    # ────────────────────────────────────────────────
+
+    AUDIT_SAMPLED_ACTIONS: List[str] = Field(
+        default=["grok_model_routed", "api_access"],
+        description="High-volume, non-compliance audit actions subject to AUDIT_SAMPLE_RATE",
+    )
+
+    AUDIT_SAMPLE_RATE: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of AUDIT_SAMPLED_ACTIONS events that are recorded",
+    )
+
+    AUDIT_INPROC: bool = Field(
+        default=False,
+        description="Batch audit writes in-process (single-node / dev) instead of via the Celery queue",
+    )
+
+
     # ────────────────────────────────────────────────
     # URLs
     # ────────────────────────────────────────────────
@@ -91,6 +123,11 @@ class Settings(BaseSettings):
 
     DATABASE_URL: PostgresDsn
 
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=0,
+        ge=0,
+        description="asyncpg prepared-statement cache size; keep 0 behind the PgBouncer/Supabase transaction pooler",
+    )
 
     @field_validator("DATABASE_URL")
     @classmethod
@@ -171,6 +208,12 @@ class Settings(BaseSettings):
 
     EMAIL_FROM_NAME: str = "CursorCode AI"
 
+    RESEND_REQUESTS_PER_SECOND: float = Field(
+        default=2.0,
+        gt=0,
+        description="Resend API request quota, enforced across all email workers",
+    )
+
 
     # ────────────────────────────────────────────────
     # xAI
@@ -0,0 +1,28 @@
+"""
+app/core/rate_limit.py
+Single shared slowapi Limiter for the whole API.
+All routers decorate with this instance so counters live in one Redis-backed store,
+shared across routers, Uvicorn workers and replicas.
+
+Usage:
+    from app.core.rate_limit import limiter
+
+    @router.post("/log-error")
+    @limiter.limit("20/minute")
+    async def log_frontend_error(request: Request, ...):
+        ...
+"""
+
+from slowapi import Limiter
+
+from app.core.config import settings
+from app.core.deps import get_user_id_or_ip
+
+limiter = Limiter(
+    key_func=get_user_id_or_ip,           # per-user ID first, fallback to IP
+    storage_uri=str(settings.REDIS_URL),  # Redis for distributed limiting
+    default_limits=["100/minute"],        # global fallback (adjust as needed)
+    enabled=True,
+    headers_enabled=True,                 # adds X-RateLimit-* headers
+    strategy="moving-window",             # sliding window: no burst at window edges
+)
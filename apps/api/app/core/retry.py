@@ -0,0 +1,46 @@
+"""
+app/core/retry.py
+Retry helpers for Celery tasks.
+Full jitter: the delay is drawn uniformly from [0, min(cap, base * 2^attempt)].
+Celery's built-in retry_jitter never goes below the backoff floor, so workers that
+failed together still retry together. Starting from zero spreads them out.
+
+Usage:
+    from app.core.retry import full_jitter_countdown
+
+    raise self.retry(
+        exc=exc,
+        countdown=full_jitter_countdown(self.default_retry_delay, self.request.retries),
+    )
+
+    # celery-batches tasks can't self.retry(); re-publish the failed requests instead
+    requeue_batch(audit_log_task, requests)
+"""
+
+import logging
+import random
+from typing import Any, List
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY_CAP = 600  # seconds
+
+
+def full_jitter_countdown(base: float, attempt: int, cap: float = RETRY_DELAY_CAP) -> float:
+    """Random retry delay in seconds for the given 0-based attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def requeue_batch(task: Any, requests: List[Any]) -> None:
+    """Re-publish a failed celery-batches flush per request, dropping those past max_retries."""
+    for req in requests:
+        retries = req.request_dict.get("retries", 0)
+        if retries >= task.max_retries:
+            logger.error(f"{task.name}: dropping request {req.id} after {retries} retries")
+            continue
+        task.apply_async(
+            kwargs=req.kwargs,
+            task_id=req.id,  # stable across retries (e.g. Resend Idempotency-Keys derive from it)
+            countdown=full_jitter_countdown(task.default_retry_delay, retries),
+            retries=retries + 1,
+        )
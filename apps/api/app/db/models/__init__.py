@@ -48,7 +48,8 @@ from .project import Project, ProjectStatus
 # ────────────────────────────────────────────────
 # Audit / logging model (references User)
 # ────────────────────────────────────────────────
-from .audit import AuditLog
+from .audit import AuditLog, HttpMethod, UserAgent
+from .app_error import AppError
 
 # ────────────────────────────────────────────────
 # Public exports (__all__)
@@ -73,6 +74,9 @@ __all__ = [
 
     # Audit trail
     "AuditLog",
+    "HttpMethod",
+    "UserAgent",
+    "AppError",
 
     # Future models (add here when created, maintain order)
     # "Subscription",
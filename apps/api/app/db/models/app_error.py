@@ -0,0 +1,61 @@
+"""
+AppError model for CursorCode AI
+Application error sink (backend exceptions, webhook failures, frontend crash reports).
+Custom monitoring table used instead of Sentry — queried from Supabase dashboards.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import BigInteger, String, Text, TIMESTAMP, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.models import Base
+
+
+class AppError(Base):
+    """
+    Application Error Entry
+    - Append-only, written in batches (see services/error_log.py)
+    - No FK on user_id: error rows must never fail to insert
+    """
+
+    __tablename__ = "app_errors"
+    __table_args__ = {'extend_existing': True}
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+    )
+    level: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        index=True,
+        comment="Source/severity (e.g. 'error', 'frontend_error', 'webhook_error')"
+    )
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    stack: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    user_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        nullable=True,
+        index=True,
+    )
+    request_path: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True)
+    request_method: Mapped[Optional[str]] = mapped_column(
+        String(16),
+        nullable=True,
+        comment="HTTP method, or 'CLIENT_SIDE' for frontend reports"
+    )
+    environment: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    extra: Mapped[Optional[Dict]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"AppError(id={self.id!r}, level={self.level!r}, message={self.message[:80]!r})"
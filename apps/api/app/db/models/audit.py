@@ -6,17 +6,71 @@ Uses mixins from db/models/mixins.py for reusable patterns.
 """
 
 from datetime import datetime, timezone  # ← added timezone
+from enum import IntEnum
 from typing import Dict, Optional
 
-from sqlalchemy import String, Text, func, Index
+import xxhash
+from sqlalchemy import BigInteger, ForeignKey, SmallInteger, String, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.models import Base
-from app.db.models.mixins import UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin
+from app.db.models.mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
 
 
-class AuditLog(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
+class HttpMethod(IntEnum):
+    """HTTP verbs stored as SMALLINT in audit rows (2 bytes vs. VARCHAR)."""
+    GET = 1
+    POST = 2
+    PUT = 3
+    PATCH = 4
+    DELETE = 5
+    HEAD = 6
+    OPTIONS = 7
+    TRACE = 8
+    CONNECT = 9
+
+    @classmethod
+    def from_str(cls, method: Optional[str]) -> Optional["HttpMethod"]:
+        """Map a request method string (any case) to its enum value; None if unknown."""
+        if not method:
+            return None
+        return cls.__members__.get(method.upper())
+
+
+# Longer headers are truncated at the edge (audit_log wrapper) so rows stay inline (no TOAST)
+USER_AGENT_MAX_LENGTH = 512
+
+
+def hash_user_agent(user_agent: str) -> int:
+    """64-bit xxhash of a User-Agent, masked to fit a signed BIGINT."""
+    return xxhash.xxh64_intdigest(user_agent.encode()) & 0x7FFFFFFFFFFFFFFF
+
+
+class UserAgent(Base):
+    """
+    User-Agent dictionary table
+    - A few dozen UAs dominate traffic; audit rows store only the 8-byte hash
+    - Rows are insert-only (INSERT ... ON CONFLICT DO NOTHING)
+    """
+
+    __tablename__ = "user_agents"
+    __table_args__ = {'extend_existing': True}
+
+    hash: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=False,
+        comment="hash_user_agent(user_agent)"
+    )
+    user_agent: Mapped[str] = mapped_column(
+        String(USER_AGENT_MAX_LENGTH),
+        nullable=False,
+        comment="User-Agent header (truncated to USER_AGENT_MAX_LENGTH)"
+    )
+
+
+class AuditLog(Base, TimestampMixin, SoftDeleteMixin, AuditMixin):
     """
     Audit Log Entry
     - Immutable record of user/system actions
@@ -28,6 +82,31 @@ class AuditLog(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
     __tablename__ = "audit_logs"
     __table_args__ = {'extend_existing': True}  # prevents duplicate table error in SQLAlchemy
 
+    # BIGINT identity — highest-write table, int32 would overflow
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Sequential audit entry ID"
+    )
+
+    # Who / which event
+    user_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        comment="Acting user (null = system/anonymous)"
+    )
+    event_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        nullable=True,
+        unique=True,
+        index=True,
+        server_default=text("gen_random_uuid()"),
+        comment="Client-generated event ID for deduplication / correlation (DB-generated if omitted)"
+    )
+
     # What happened
     action: Mapped[str] = mapped_column(
         String(100),
@@ -51,20 +130,21 @@ class AuditLog(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
         index=True,
         comment="Client IP (IPv4 or IPv6)"
     )
-    user_agent: Mapped[Optional[str]] = mapped_column(
-        Text,
+    user_agent_hash: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
         nullable=True,
-        comment="User-Agent header"
+        index=True,
+        comment="User-Agent header, dictionary-encoded (FK-style ref to user_agents.hash)"
     )
     request_path: Mapped[Optional[str]] = mapped_column(
         String(255),
         nullable=True,
         comment="API endpoint/path that triggered the action"
     )
-    request_method: Mapped[Optional[str]] = mapped_column(
-        String(10),
+    request_method: Mapped[Optional[HttpMethod]] = mapped_column(
+        SmallInteger,
         nullable=True,
-        comment="HTTP method (GET, POST, etc.)"
+        comment="HTTP method as HttpMethod enum value (1=GET, 2=POST, ...)"
     )
     request_id: Mapped[Optional[str]] = mapped_column(
         String(36),
@@ -77,11 +157,16 @@ class AuditLog(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # created_at, updated_at, deleted_at already present
 
     def __repr__(self) -> str:
-        fields = [f"id={self.id}", f"action={self.action!r}"]
-        if self.user_id:
-            fields.append(f"user_id={self.user_id}")
-        fields.append(f"created_at={self.created_at}")
-        return f"<AuditLog({' '.join(fields)})>"
+        # Single pre-shaped f-string — no list building, cheap on hot log paths
+        return (
+            f"AuditLog(id={self.id!r}, user_id={self.user_id!r}, "
+            f"action={self.action!r}, created_at={self.created_at!r})"
+        )
+
+    @property
+    def request_method_name(self) -> Optional[str]:
+        """Readable HTTP method (e.g. 'POST') for the stored SMALLINT value."""
+        return HttpMethod(self.request_method).name if self.request_method else None
 
     @property
     def is_active(self) -> bool:
@@ -5,7 +5,7 @@ All models inherit from this Base class.
 
 This file is kept minimal:
 - Defines the abstract Base (never mapped to a table)
-- Provides safe __repr__ / __str__ helpers
+- Provides a safe __repr__ helper (str() falls back to it)
 - Global __table_args__ with extend_existing=True to prevent duplicate table errors during import
 - All reusable patterns (timestamps, UUID, soft-delete, audit, slug, etc.) are in db/models/mixins.py and utils.py
 
@@ -25,7 +25,7 @@ class Base(DeclarativeBase):
     - __abstract__ = True → prevents Base from being mapped as a table
     - Global __table_args__ with extend_existing=True — fixes duplicate table errors when models are imported multiple times (common with aggregators)
     - No automatic table name generation (define __tablename__ explicitly in each model)
-    - Safe __repr__ / __str__ helpers for debugging/logs
+    - Safe __repr__ helper for debugging/logs (object.__str__ already delegates to it)
 
     All concrete models should inherit from Base + mixins from db/models/mixins.py
     """
@@ -45,7 +45,3 @@ class Base(DeclarativeBase):
             if not k.startswith("_") and v is not None
         )
         return f"{self.__class__.__name__}({fields})"
-
-    def __str__(self) -> str:
-        """Human-readable string representation (useful in logs and debugging)."""
-        return self.__repr__()
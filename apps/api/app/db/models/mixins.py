@@ -2,7 +2,7 @@
 """
 Reusable SQLAlchemy mixins for CursorCode AI models.
 These mixins provide common patterns used across entities:
-- UUID primary key (UUIDv4)
+- UUID primary key (UUIDv7, time-ordered)
 - Automatic timestamps (created_at / updated_at)
 - Soft-delete support (deleted_at)
 - Audit trail (created_by / updated_by)
@@ -15,34 +15,34 @@ Usage example:
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
-from uuid import uuid4
 
-from sqlalchemy import String, func, ForeignKey
+from uuid_utils.compat import uuid7
+from sqlalchemy import String, func, ForeignKey, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from zoneinfo import ZoneInfo  # For timezone-aware timestamps
-
 from .base import Base
 
 
-UTC = ZoneInfo("UTC")
+UTC = timezone.utc  # For timezone-aware timestamps
 
 
 class UUIDMixin:
     """
-    Mixin that uses UUIDv4 as primary key instead of autoincrement int.
+    Mixin that uses UUIDv7 as primary key instead of autoincrement int.
     Recommended default for distributed systems (no conflicts, easier sharding).
+    Generated app-side: v7 is time-ordered, so inserts land on the right edge
+    of the B-tree instead of scattering like random v4 IDs.
+    Existing v4 rows stay valid — both share the same UUID column type.
     """
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        server_default=func.gen_random_uuid(),
+        default=uuid7,
         index=True,
-        comment="Unique identifier (UUIDv4)"
+        comment="Unique identifier (UUIDv7)"
     )
 
 
@@ -50,15 +50,17 @@ class TimestampMixin:
     """
     Mixin that adds automatic created_at / updated_at timestamps.
     Server-side defaults and updates — no Python code needed.
-    Timestamps are UTC-aware.
+    Timestamps are UTC-aware (explicit TIMESTAMPTZ, 8 bytes).
     """
     created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
         server_default=func.now(),
         nullable=False,
         comment="When the record was created (UTC)"
     )
 
     updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
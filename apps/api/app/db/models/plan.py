@@ -6,19 +6,41 @@ Auto-created prices are cached here for idempotency and fast lookup.
 Uses mixins from db/models/mixins.py for reusable patterns.
 """
 
-from datetime import datetime
-from typing import Optional
+import asyncio
+import logging
+from functools import cached_property
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Boolean, Index, Integer, String, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from cachetools import TTLCache
+from sqlalchemy import Boolean, Integer, SmallInteger, String, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, make_transient_to_detached, mapped_column
 
 from app.db.models import Base
-from app.db.models.mixins import UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin
+from app.db.models.mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
 from app.db.models.utils import generate_unique_slug
 
+logger = logging.getLogger(__name__)
 
-class Plan(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
+# ────────────────────────────────────────────────
+# In-process Plan cache (read-mostly reference data)
+# ────────────────────────────────────────────────
+# Keyed by ("name", value) / ("stripe_price_id", value).
+# Holds plain column values, never ORM instances: each hit rebuilds a Plan attached
+# to the caller's session, so no instance is shared across sessions.
+# Write through UPDATE statements, then call invalidate_plan_cache() so every
+# worker drops its copy.
+PLAN_CACHE_TTL_SECONDS = 300
+PLAN_INVALIDATE_CHANNEL = "plans:invalidate"
+
+# Listener reconnect backoff (full jitter, see app/core/retry.py)
+PLAN_LISTENER_RETRY_BASE = 1.0   # seconds
+PLAN_LISTENER_RETRY_CAP = 60.0   # seconds
+
+_plan_cache: TTLCache = TTLCache(maxsize=128, ttl=PLAN_CACHE_TTL_SECONDS)
+
+
+class Plan(Base, TimestampMixin, SoftDeleteMixin, AuditMixin):
     """
     Billing Plan Entity
     - Defines available subscription tiers (starter, pro, ultra, etc.)
@@ -29,6 +51,15 @@ class Plan(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
     __tablename__ = "plans"
     __table_args__ = {'extend_existing': True}  # ← FINAL FIX: prevents duplicate table error in SQLAlchemy
 
+    # Tiny table (handful of tiers) → 2-byte PK keeps any referencing FK narrow.
+    # Internal only: `name` is the stable public identifier (URLs, metadata, Stripe).
+    id: Mapped[int] = mapped_column(
+        SmallInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Internal surrogate key"
+    )
+
     # Plan identifier (used in code, URLs, metadata)
     name: Mapped[str] = mapped_column(
         String(50),
@@ -97,9 +128,13 @@ class Plan(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # deleted_at already present
 
     def __repr__(self) -> str:
-        price = f"${self.price_usd:.2f}" if self.price_usd_cents else "$0.00"
         status = "active" if self.is_active else f"deleted:{self.deleted_at}"
-        return f"<Plan(name={self.name}, display={self.display_name}, price={price}/{self.interval}, status={status})>"
+        return f"<Plan(name={self.name}, display={self.display_name}, price={self._price_str}/{self.interval}, status={status})>"
+
+    @cached_property
+    def _price_str(self) -> str:
+        """Formatted price, computed once per instance (plans are effectively immutable)."""
+        return f"${self.price_usd:.2f}" if self.price_usd_cents else "$0.00"
 
     @property
     def price_usd(self) -> float:
@@ -111,7 +146,95 @@ class Plan(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
         """Quick check if this is the free tier."""
         return self.price_usd_cents == 0
 
+    @classmethod
+    async def get_by_name(cls, session: AsyncSession, name: str) -> Optional["Plan"]:
+        """Fetch plan by internal name, served from the in-process TTL cache when warm."""
+        return await cls._get_cached(session, "name", name)
+
+    @classmethod
+    async def get_by_stripe_price_id(cls, session: AsyncSession, price_id: str) -> Optional["Plan"]:
+        """Fetch plan by Stripe Price ID, served from the in-process TTL cache when warm."""
+        return await cls._get_cached(session, "stripe_price_id", price_id)
+
+    @classmethod
+    async def _get_cached(cls, session: AsyncSession, field: str, value: str) -> Optional["Plan"]:
+        values = _plan_cache.get((field, value))
+        if values is not None:
+            # Detached copy → merge(load=False) attaches it to this session without SQL
+            plan = cls(**values)
+            make_transient_to_detached(plan)
+            return await session.merge(plan, load=False)
+
+        plan = await session.scalar(select(cls).where(getattr(cls, field) == value))
+        if plan is not None:
+            values = cls._column_values(plan)
+            # Store under both keys so either lookup path warms the other
+            _plan_cache[("name", plan.name)] = values
+            if plan.stripe_price_id:
+                _plan_cache[("stripe_price_id", plan.stripe_price_id)] = values
+        return plan
+
+    @classmethod
+    def _column_values(cls, plan: "Plan") -> Dict[str, Any]:
+        return {attr.key: getattr(plan, attr.key) for attr in inspect(cls).column_attrs}
+
     @classmethod
     async def create_unique_slug(cls, display_name: str, db) -> str:
         """Generate unique slug for this plan based on display name (future use)."""
         return await generate_unique_slug(display_name, cls, db=db)
+
+
+# ────────────────────────────────────────────────
+# Cache invalidation (local + cross-worker via Redis pub/sub)
+# ────────────────────────────────────────────────
+async def invalidate_plan_cache(publish: bool = True) -> None:
+    """
+    Drop all cached plans in this process and (optionally) tell other workers to do the same.
+    Call after any admin/service write to the 'plans' table.
+    """
+    _plan_cache.clear()
+
+    if not publish:
+        return
+
+    from app.core.redis import get_redis_client
+
+    try:
+        async with get_redis_client() as redis:
+            await redis.publish(PLAN_INVALIDATE_CHANNEL, b"1")
+    except Exception as e:
+        # TTL still bounds staleness if Redis is unavailable
+        logger.warning(f"Plan cache invalidation publish failed: {e}")
+
+
+async def listen_for_plan_invalidations() -> None:
+    """
+    Long-running subscriber: clears the local Plan cache whenever another worker
+    publishes on PLAN_INVALIDATE_CHANNEL. Started from the app lifespan (cancelled on
+    shutdown); reconnects with backoff whenever Redis drops the connection.
+    """
+    from app.core.redis import get_redis_client
+    from app.core.retry import full_jitter_countdown
+
+    attempt = 0
+    while True:
+        try:
+            async with get_redis_client() as redis:
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(PLAN_INVALIDATE_CHANNEL)
+                # Invalidations published while disconnected were missed
+                _plan_cache.clear()
+                attempt = 0
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            _plan_cache.clear()
+                finally:
+                    await pubsub.unsubscribe(PLAN_INVALIDATE_CHANNEL)
+                    await pubsub.close()
+        except Exception as e:
+            # Non-fatal: cached plans still expire after PLAN_CACHE_TTL_SECONDS meanwhile
+            logger.warning(f"Plan cache invalidation listener disconnected: {e}")
+
+        await asyncio.sleep(full_jitter_countdown(PLAN_LISTENER_RETRY_BASE, attempt, PLAN_LISTENER_RETRY_CAP))
+        attempt += 1
@@ -9,7 +9,7 @@ Uses mixins from db/models/mixins.py for reusable patterns.
 from datetime import datetime
 from typing import List, Optional, Dict
 
-from sqlalchemy import ForeignKey, Index, Integer, JSON, String, Text, func, Enum as SQLEnum
+from sqlalchemy import ForeignKey, Index, Integer, JSON, String, Text, func, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -133,3 +133,17 @@ class Project(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin):
     async def create_unique_slug(cls, title: str, db) -> str:
         """Generate unique slug for this project based on title (future use)."""
         return await generate_unique_slug(title, cls, db=db)
+
+
+# ────────────────────────────────────────────────
+# Admin query indexes (declared after the class so columns can be ordered DESC)
+# ────────────────────────────────────────────────
+# Backs /admin/projects/failed and the overview status counters.
+# Partial: only statuses the admin dashboards filter on (enum stores member names).
+Index(
+    "idx_projects_status_created",
+    Project.status,
+    Project.created_at.desc(),
+    postgresql_where=text("status IN ('FAILED', 'BUILDING', 'COMPLETED')"),
+    postgresql_concurrently=True,
+)
@@ -8,7 +8,7 @@ Uses mixins from db/models/mixins.py for reusable patterns.
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, ForeignKey, JSON, String, Text, func, Integer
+from sqlalchemy import Boolean, ForeignKey, Index, JSON, String, Text, func, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -66,6 +66,7 @@ class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin, SlugMix
     email: Mapped[str] = mapped_column(
         String(255), unique=True, nullable=False, index=True
     )
+    name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     hashed_password: Mapped[Optional[str]] = mapped_column(
         String(255), nullable=True  # Null for OAuth-only users
     )
@@ -149,3 +150,21 @@ class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, AuditMixin, SlugMix
     async def create_unique_slug(cls, email: str, db) -> str:
         base = email.split("@")[0]
         return await generate_unique_slug(base, cls, db=db)
+
+
+# ────────────────────────────────────────────────
+# Admin query indexes (declared after the class so columns can be ordered DESC)
+# ────────────────────────────────────────────────
+# /admin/users/recent ordering + overview "new users" counters
+Index("idx_users_created", User.created_at.desc(), postgresql_concurrently=True)
+
+# /admin/subscriptions/active filters + overview by-plan breakdown
+Index("idx_users_sub_plan", User.subscription_status, User.plan, postgresql_concurrently=True)
+
+# /admin/users/recent `email ILIKE '%...%'` search (requires: CREATE EXTENSION pg_trgm)
+Index(
+    "idx_users_email_trgm",
+    User.email,
+    postgresql_using="gin",
+    postgresql_ops={"email": "gin_trgm_ops"},
+)
@@ -9,6 +9,7 @@ FINAL Production Fix:
 • Disable prepared statements for PgBouncer/Supabase pooler
 """
 
+import asyncio
 import logging
 import ssl
 from contextlib import asynccontextmanager
@@ -21,7 +22,8 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from sqlalchemy import text
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
 
 from app.core.config import settings
 
@@ -64,9 +66,10 @@ engine: AsyncEngine = create_async_engine(
         "server_settings": {
             "application_name": "cursorcode-api"
         },
-        # CRITICAL: Disable prepared statements for Supabase pooler
-        "statement_cache_size": 0,
-        "prepared_statement_cache_size": 0,
+        # CRITICAL: Prepared statements stay disabled (0) for Supabase pooler;
+        # direct connections can opt in via DB_STATEMENT_CACHE_SIZE
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
         "max_cached_statement_lifetime": 0,
         "command_timeout": 60,
         "timeout": 60,
@@ -74,6 +77,31 @@ engine: AsyncEngine = create_async_engine(
 )
 
 
+# ────────────────────────────────────────────────
+# Sync Engine - Celery workers
+# ────────────────────────────────────────────────
+# Workers run plain sync tasks; psycopg2 skips the event loop and the
+# greenlet bridge AsyncSession needs. The pool is lazy, so importing this
+# from the API process opens no connections.
+
+sync_engine: Engine = create_engine(
+
+    make_url(DATABASE_URL).set(drivername="postgresql+psycopg2"),
+
+    pool_size=5,
+    max_overflow=10,
+    pool_recycle=1800,
+
+    pool_pre_ping=True,
+
+    connect_args={
+        # Same trust model as the asyncpg ssl_context above (encrypt, no verify)
+        "sslmode": "require",
+        "application_name": "cursorcode-worker",
+    },
+)
+
+
 # ────────────────────────────────────────────────
 # Session
 # ────────────────────────────────────────────────
@@ -143,10 +171,22 @@ async def init_db():
 @asynccontextmanager
 async def lifespan(app):
 
+    from app.db.models.plan import listen_for_plan_invalidations
+    from app.services.error_log import run_app_error_flusher, stop_app_error_flusher
+    from app.services.logging import start_audit_batcher, stop_audit_batcher
+
     await init_db()
 
+    plan_listener = asyncio.create_task(listen_for_plan_invalidations())
+    error_flusher = asyncio.create_task(run_app_error_flusher())
+    start_audit_batcher()
+
     yield
 
+    plan_listener.cancel()
+    await stop_app_error_flusher(error_flusher)
+    await asyncio.to_thread(stop_audit_batcher)
+
     await engine.dispose()
 
     logger.info("Database engine closed")
@@ -24,7 +24,9 @@ from slowapi.errors import RateLimitExceeded
 from sqlalchemy import text, insert
 
 from app.core.config import settings
+from app.core.celery_app import celery_app  # noqa: F401 — binds @shared_task publishers to the Redis broker
 from app.db.session import lifespan as db_lifespan, get_db
+from app.db.models.app_error import AppError
 from app.routers import (
     auth,
     orgs,
@@ -35,6 +37,7 @@ from app.routers import (
     monitoring,
 )
 
+from app.middleware.audit import AuditContextMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.rate_limit import (
     limiter,
@@ -44,8 +47,9 @@ from app.middleware.rate_limit import (
 
 # Prometheus optional
 try:
-    from prometheus_client import generate_latest
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
     from app.monitoring.metrics import registry
+    from app.middleware.metrics import PrometheusMetricsMiddleware
     PROMETHEUS_ENABLED = True
 except Exception:
     registry = None
@@ -91,6 +95,11 @@ app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(RateLimitMiddleware)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+# Audit context (IP / UA / request ID, extracted once per request)
+app.add_middleware(AuditContextMiddleware)
+# HTTP metrics (outermost → times the full middleware stack)
+if PROMETHEUS_ENABLED:
+    app.add_middleware(PrometheusMetricsMiddleware)
 
 # ────────────────────────────────────────────────
 # Routers
@@ -119,7 +128,9 @@ async def root():
 async def metrics():
     if not PROMETHEUS_ENABLED:
         return {"detail": "Prometheus disabled"}
-    return Response(generate_latest(registry), media_type="text/plain")
+    # generate_latest() returns one joined bytes object — hand it to the response as-is
+    # (no str round-trip, no extra buffer copy) with the exposition-format content type
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
 
 # ────────────────────────────────────────────────
 # Exception Handler
@@ -130,7 +141,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     try:
         async for db in get_db():
             await db.execute(
-                insert(text("app_errors")).values(
+                insert(AppError).values(
                     level="error",
                     message=str(exc),
                     stack=traceback.format_exc(),
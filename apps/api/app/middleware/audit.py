@@ -0,0 +1,69 @@
+"""
+app/middleware/audit.py
+Captures the audit request context (client IP, User-Agent, X-Request-ID) once per request
+into request.state.audit_ctx, so audit_log() reads a single attribute however many
+times a route calls it.
+"""
+
+from typing import NamedTuple, Optional
+
+from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db.models.audit import USER_AGENT_MAX_LENGTH
+
+
+class AuditContext(NamedTuple):
+    ip: Optional[str]
+    user_agent: Optional[str]
+    request_id: Optional[str]
+
+    @classmethod
+    def from_request(cls, request: Request) -> "AuditContext":
+        """Fallback for requests that didn't pass through AuditContextMiddleware."""
+        return cls(
+            request.client.host if request.client else None,
+            request.headers.get("user-agent", "")[:USER_AGENT_MAX_LENGTH] or None,
+            request.headers.get("X-Request-ID"),
+        )
+
+
+class AuditContextMiddleware:
+    """
+    Pure ASGI middleware: it only annotates the scope, so it skips the
+    BaseHTTPMiddleware task/stream wrapping. Raw headers are scanned once.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            user_agent = request_id = None
+            for name, value in scope["headers"]:
+                if name == b"user-agent":
+                    user_agent = value.decode("latin-1")[:USER_AGENT_MAX_LENGTH] or None
+                elif name == b"x-request-id":
+                    request_id = value.decode("latin-1")
+
+            client = scope.get("client")
+            # request.state is backed by scope["state"]
+            scope.setdefault("state", {})["audit_ctx"] = AuditContext(
+                client[0] if client else None,
+                user_agent,
+                request_id,
+            )
+
+        await self.app(scope, receive, send)
+
+
+# ────────────────────────────────────────────────
+# Integration in main.py (recommended pattern)
+# ────────────────────────────────────────────────
+"""
+In main.py (after app = FastAPI(...)):
+
+from app.middleware.audit import AuditContextMiddleware
+
+app.add_middleware(AuditContextMiddleware)
+"""
@@ -144,7 +144,7 @@ async def get_current_user(
 
     # 6. Audit (sampled)
     if settings.AUDIT_ALL_AUTH or secrets.randbelow(10) == 0:
-        audit_log.delay(
+        audit_log(
             user_id=auth_user.id,
             action="auth_access",
             metadata={
@@ -0,0 +1,76 @@
+"""
+app/middleware/metrics.py
+Records Prometheus HTTP metrics (request count, latency, errors) for every request.
+Labels use the matched FastAPI route template (e.g. /admin/users/{user_id}/credits/adjust),
+never the raw URL, so series count stays bounded by the number of routes.
+"""
+
+import logging
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.monitoring.metrics import (
+    http_request_duration_seconds,
+    http_llm_request_duration_seconds,
+    http_req_child,
+    http_error_child,
+    http_duration_child,
+)
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_PATH = "unknown"
+
+# Generation routes (they wait on Grok) → "llm" latency buckets; everything else,
+# incl. project CRUD and billing, keeps the fine-grained fast buckets.
+# Matched on the route template's tail, so the mount prefix doesn't matter
+LLM_ROUTE_SUFFIXES = (
+    "/{project_id}/stream",  # projects.stream_project (SSE orchestration)
+)
+
+
+def duration_histogram(path: str):
+    """Pick the histogram whose buckets match the route's latency regime."""
+    if path.endswith(LLM_ROUTE_SUFFIXES):
+        return http_llm_request_duration_seconds
+    return http_request_duration_seconds
+
+
+def route_path(request: Request) -> str:
+    """Route template for the matched endpoint, or UNMATCHED_PATH (404s, scanners)."""
+    route = request.scope.get("route")
+    return route.path if route is not None else UNMATCHED_PATH
+
+
+class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        start = time.perf_counter()
+        status = "500"
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            # Route is resolved during call_next, so read it afterwards
+            method = request.method
+            path = route_path(request)
+            http_req_child(method, path, status).inc()
+            http_duration_child(duration_histogram(path), method, path, status).observe(time.perf_counter() - start)
+            if status[0] in "45":
+                http_error_child(method, path, status).inc()
+
+
+# ────────────────────────────────────────────────
+# Integration in main.py (recommended pattern)
+# ────────────────────────────────────────────────
+"""
+In main.py (after app = FastAPI(...)):
+
+from app.middleware.metrics import PrometheusMetricsMiddleware
+
+app.add_middleware(PrometheusMetricsMiddleware)
+"""
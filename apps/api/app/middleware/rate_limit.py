@@ -8,31 +8,18 @@ import logging
 from typing import Callable, Optional
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
-from slowapi import Limiter
+from fastapi.responses import ORJSONResponse
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from app.core.config import settings
 from app.core.deps import get_user_id_or_ip
+from app.core.rate_limit import limiter  # shared instance (re-exported for main.py)
 from app.services.logging import audit_log
 
 logger = logging.getLogger(__name__)
 
-# ────────────────────────────────────────────────
-# Global Limiter Configuration (Redis backend)
-# ────────────────────────────────────────────────
-limiter = Limiter(
-    key_func=get_user_id_or_ip,           # per-user ID first, fallback to IP
-    storage_uri=str(settings.REDIS_URL),  # Redis for distributed limiting
-    default_limits=["100/minute"],        # global fallback (adjust as needed)
-    enabled=True,
-    headers_enabled=True,                 # adds X-RateLimit-* headers
-    strategy="fixed-window",              # or "moving-window" for smoother
-)
-
-
 # ────────────────────────────────────────────────
 # Custom key functions (more granular & fair)
 # ────────────────────────────────────────────────
@@ -81,7 +68,7 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
 
     # Audit (sampled to avoid flooding in abuse scenarios)
     if settings.AUDIT_ALL_RATE_LIMIT or hash(str(user_id or ip)) % 10 == 0:
-        audit_log.delay(
+        audit_log(
             user_id=user_id,
             action="rate_limit_exceeded",
             metadata={
@@ -98,7 +85,7 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
     retry_after = getattr(exc, "retry_after", 60)
     headers["Retry-After"] = str(retry_after)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={
             "detail": "Rate limit exceeded. Please try again later.",
@@ -5,10 +5,43 @@ Exported for use in middleware and /metrics endpoint.
 Production-ready (2026): consistent labels, detailed error tracking, histograms for latency.
 """
 
+from typing import Dict, Tuple
+
 from prometheus_client import Counter, Histogram, REGISTRY
 
+from app.core.config import settings
+
 registry = REGISTRY
 
+
+def exponential_buckets_range(min_value: float, max_value: float, count: int) -> Tuple[float, ...]:
+    """
+    `count` exponentially spaced bucket bounds from min_value to max_value (inclusive).
+    Same semantics as the Go client's ExponentialBucketsRange — constant relative error per bucket.
+    """
+    factor = (max_value / min_value) ** (1 / (count - 1))
+    return tuple(round(min_value * factor ** i, 6) for i in range(count))
+
+# ────────────────────────────────────────────────
+# Bucket layouts (matched to each latency regime; +Inf is added by the client)
+# ────────────────────────────────────────────────
+# CRUD / auth / admin routes
+FAST_ROUTE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Generation routes that wait on Grok (p50 in the seconds range; see middleware.metrics)
+LLM_ROUTE_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90, 120)
+
+# Geometric (~1.8x) spacing → roughly constant relative error for histogram_quantile
+DATASTORE_BUCKETS = (
+    0.001, 0.0018, 0.0032, 0.0056, 0.01, 0.018, 0.032, 0.056, 0.1, 0.18, 0.32, 0.56, 1.0,
+)
+
+# PROMETHEUS_NATIVE_HISTOGRAMS=1 → one sparse exponential layout for every latency histogram.
+# The pinned prometheus_client (0.20) cannot expose the native-histogram wire format yet;
+# this is the bucket-layout step, ready to flip to native exposition on client upgrade.
+if settings.PROMETHEUS_NATIVE_HISTOGRAMS:
+    FAST_ROUTE_BUCKETS = LLM_ROUTE_BUCKETS = DATASTORE_BUCKETS = exponential_buckets_range(0.001, 60, 32)
+
 # ────────────────────────────────────────────────
 # HTTP Request Metrics
 # ────────────────────────────────────────────────
@@ -18,11 +51,20 @@ http_requests_total = Counter(
     labelnames=["method", "path", "status"],
 )
 
+# route_class=fast
 http_request_duration_seconds = Histogram(
     name="http_request_duration_seconds",
-    documentation="HTTP request duration in seconds",
+    documentation="HTTP request duration in seconds (fast CRUD routes)",
+    labelnames=["method", "path", "status"],
+    buckets=FAST_ROUTE_BUCKETS,
+)
+
+# route_class=llm — separate metric because bucket layouts differ
+http_llm_request_duration_seconds = Histogram(
+    name="http_llm_request_duration_seconds",
+    documentation="HTTP request duration in seconds (LLM generation routes)",
     labelnames=["method", "path", "status"],
-    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")),
+    buckets=LLM_ROUTE_BUCKETS,
 )
 
 http_request_errors_total = Counter(
@@ -31,6 +73,41 @@ http_request_errors_total = Counter(
     labelnames=["method", "path", "status"],
 )
 
+# ────────────────────────────────────────────────
+# Cached HTTP child instruments (hot path: every request)
+# ────────────────────────────────────────────────
+# .labels() builds a tuple and takes a lock + dict lookup per call; cache the children
+# in plain dicts. Size is bounded by route-template labels (routes × methods × statuses).
+_http_req_children: Dict[Tuple[str, str, str], Counter] = {}
+_http_error_children: Dict[Tuple[str, str, str], Counter] = {}
+_http_duration_children: Dict[Tuple[int, str, str, str], Histogram] = {}
+
+
+def http_req_child(method: str, path: str, status: str):
+    key = (method, path, status)
+    child = _http_req_children.get(key)
+    if child is None:
+        child = _http_req_children[key] = http_requests_total.labels(method=method, path=path, status=status)
+    return child
+
+
+def http_error_child(method: str, path: str, status: str):
+    key = (method, path, status)
+    child = _http_error_children.get(key)
+    if child is None:
+        child = _http_error_children[key] = http_request_errors_total.labels(method=method, path=path, status=status)
+    return child
+
+
+def http_duration_child(histogram: Histogram, method: str, path: str, status: str):
+    """`histogram` is http_request_duration_seconds or http_llm_request_duration_seconds."""
+    key = (id(histogram), method, path, status)
+    child = _http_duration_children.get(key)
+    if child is None:
+        child = _http_duration_children[key] = histogram.labels(method=method, path=path, status=status)
+    return child
+
+
 # ────────────────────────────────────────────────
 # Database Query Metrics
 # ────────────────────────────────────────────────
@@ -38,7 +115,7 @@ db_query_duration_seconds = Histogram(
     name="db_query_duration_seconds",
     documentation="Database query duration in seconds",
     labelnames=["query_type", "table"],
-    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float("inf")),
+    buckets=DATASTORE_BUCKETS,
 )
 
 db_query_errors_total = Counter(
@@ -54,7 +131,7 @@ redis_operation_duration_seconds = Histogram(
     name="redis_operation_duration_seconds",
     documentation="Redis operation duration in seconds",
     labelnames=["operation", "key_type"],
-    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, float("inf")),
+    buckets=DATASTORE_BUCKETS,
 )
 
 redis_errors_total = Counter(
@@ -63,6 +140,40 @@ redis_errors_total = Counter(
     labelnames=["operation", "error_type"],
 )
 
+# ────────────────────────────────────────────────
+# Error Sink Metrics
+# ────────────────────────────────────────────────
+frontend_errors_dropped_total = Counter(
+    name="frontend_errors_dropped_total",
+    documentation="Error reports dropped because the in-process app_errors buffer was full",
+)
+
+# ────────────────────────────────────────────────
+# Public exports (__all__)
+# ────────────────────────────────────────────────
+# Every metric is registered exactly once, here. Import from this module —
+# never re-declare a Counter/Histogram with the same name elsewhere
+# (prometheus_client raises "Duplicated timeseries" on re-registration).
+__all__ = [
+    "registry",
+    # HTTP (canonical trio + LLM-route latency)
+    "http_requests_total",
+    "http_request_duration_seconds",
+    "http_llm_request_duration_seconds",
+    "http_request_errors_total",
+    "http_req_child",
+    "http_error_child",
+    "http_duration_child",
+    # Database
+    "db_query_duration_seconds",
+    "db_query_errors_total",
+    # Redis
+    "redis_operation_duration_seconds",
+    "redis_errors_total",
+    # Error sink
+    "frontend_errors_dropped_total",
+]
+
 # ────────────────────────────────────────────────
 # Usage Notes & Integration
 # ────────────────────────────────────────────────
@@ -71,24 +182,16 @@ In main.py or middleware:
 
 from app.monitoring.metrics import registry
 
-# Expose /metrics endpoint (Prometheus scraping)
+# Expose /metrics endpoint (Prometheus scraping) — see main.py
 @app.get("/metrics")
 async def metrics():
-    from prometheus_client import generate_latest
-    return Response(generate_latest(registry), media_type="text/plain")
-
-# In middleware (example increment):
-http_requests_total.labels(
-    method=request.method,
-    path=request.url.path,
-    status=response.status_code
-).inc()
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
 
-http_request_duration_seconds.labels(
-    method=request.method,
-    path=request.url.path,
-    status=response.status_code
-).observe(duration_seconds)
+# HTTP metrics are recorded by app.middleware.metrics.PrometheusMetricsMiddleware
+# through the cached children: http_req_child(m, p, s).inc(), etc.
+# `path` is always the route template (request.scope["route"].path), never
+# request.url.path — raw URLs with IDs would create unbounded label cardinality.
 
 # On DB error:
 db_query_errors_total.labels(
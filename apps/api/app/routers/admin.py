@@ -7,26 +7,40 @@ Statistics, user management, subscriptions, failed builds, maintenance.
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Annotated, Optional, Dict, Any
-from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Query, Body, HTTPException
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Query, Body, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select, func, desc
+from redis.asyncio import RedisError
+from sqlalchemy import bindparam, select, func, desc, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import DBSession, CurrentAdminUser
+from app.core.enums import Plan
+from app.core.redis import get_redis_client
 from app.db.models.user import User
 from app.db.models.org import Org
 from app.db.models.project import Project, ProjectStatus
 from app.services.billing import refund_credits
 from app.services.logging import audit_log
-from app.tasks.email import send_email_task
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+# orjson encodes UUID/datetime natively in C; list endpoints return ORJSONResponse
+# directly so rows also skip FastAPI's pure-Python jsonable_encoder pass
+router = APIRouter(prefix="/admin", tags=["Admin"], default_response_class=ORJSONResponse)
+
+UTC = timezone.utc  # C-level singleton — cheaper than ZoneInfo("UTC") lookups
+
+# Overview stats cache (dashboards poll far more often than the numbers move)
+OVERVIEW_CACHE_TTL = 30  # seconds — aligned with Prometheus scrape cadence
+OVERVIEW_CACHE_PREFIX = "admin:overview:"
+OVERVIEW_MAX_LOOKBACK_DAYS = 365  # lookback_days is 1..this → one cache key per value
+
+PLAN_NAMES = [plan.value for plan in Plan]
 
 
 # ────────────────────────────────────────────────
@@ -50,6 +64,76 @@ class AdminStatsOverview(BaseModel):
     recent_activity: Dict[str, int]
 
 
+# ────────────────────────────────────────────────
+# Overview statements
+# ────────────────────────────────────────────────
+# Built once at import: only the time bounds vary per call, so every request
+# reuses the same Select objects and hits the engine's compiled-SQL cache
+_USER_STATS = select(
+    func.count().label("total"),
+    func.count().filter(User.is_verified == True).label("verified"),
+    func.count().filter(User.updated_at >= bindparam("since")).label("active"),
+    func.count().filter(User.created_at >= bindparam("since")).label("new"),
+    func.count().filter(User.created_at >= bindparam("since_24h")).label("new_24h"),
+    func.count().filter(User.subscription_status == "active").label("subscribed"),
+).select_from(User)
+
+_ORG_STATS = select(
+    func.count().label("total"),
+    func.count().filter(Org.deleted_at.is_(None)).label("active"),
+).select_from(Org)
+
+_PROJECT_STATS = select(
+    func.count().label("total"),
+    func.count().filter(Project.status == ProjectStatus.COMPLETED).label("completed"),
+    func.count().filter(Project.status == ProjectStatus.FAILED).label("failed"),
+    func.count().filter(Project.status == ProjectStatus.BUILDING).label("building"),
+    func.count().filter(Project.created_at >= bindparam("since_24h")).label("new_24h"),
+).select_from(Project)
+
+_PLAN_COUNTS = (
+    select(User.plan, func.count())
+    .where(User.plan.in_(PLAN_NAMES))
+    .group_by(User.plan)
+)
+
+
+# ────────────────────────────────────────────────
+# Overview cache helpers (Redis, best-effort)
+# ────────────────────────────────────────────────
+async def _get_cached_overview(lookback_days: int) -> Optional[Dict[str, Any]]:
+    try:
+        async with get_redis_client() as redis:
+            cached = await redis.get(f"{OVERVIEW_CACHE_PREFIX}{lookback_days}")
+    except RedisError as e:
+        logger.warning(f"Overview cache read failed: {e}")
+        return None
+    return orjson.loads(cached) if cached else None
+
+
+async def _set_cached_overview(lookback_days: int, stats: Dict[str, Any]) -> None:
+    try:
+        async with get_redis_client() as redis:
+            await redis.setex(
+                f"{OVERVIEW_CACHE_PREFIX}{lookback_days}",
+                OVERVIEW_CACHE_TTL,
+                orjson.dumps(stats),
+            )
+    except RedisError as e:
+        logger.warning(f"Overview cache write failed: {e}")
+
+
+async def invalidate_overview_cache() -> None:
+    """Drop every cached overview (all lookback windows) after an admin write."""
+    # The key set is bounded and known: one DEL, no keyspace SCAN
+    keys = [f"{OVERVIEW_CACHE_PREFIX}{days}" for days in range(1, OVERVIEW_MAX_LOOKBACK_DAYS + 1)]
+    try:
+        async with get_redis_client() as redis:
+            await redis.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Overview cache invalidation failed: {e}")
+
+
 # ────────────────────────────────────────────────
 # Platform Statistics Overview
 # ────────────────────────────────────────────────
@@ -57,48 +141,56 @@ class AdminStatsOverview(BaseModel):
 async def get_platform_overview_stats(
     current_user: CurrentAdminUser,
     db: DBSession,
-    lookback_days: int = Query(30, ge=1, le=365, description="Lookback period in days"),
+    lookback_days: int = Query(30, ge=1, le=OVERVIEW_MAX_LOOKBACK_DAYS, description="Lookback period in days"),
 ):
-    since = datetime.now(ZoneInfo("UTC")) - timedelta(days=lookback_days)
-
-    stats = {}
-
-    total_users = await db.scalar(select(func.count(User.id)))
-    stats["users"] = {
-        "total": total_users,
-        "verified": await db.scalar(select(func.count(User.id)).where(User.is_verified == True)),
-        "active_last_30d": await db.scalar(select(func.count(User.id)).where(User.updated_at >= since)),
-        "new_last_30d": await db.scalar(select(func.count(User.id)).where(User.created_at >= since)),
+    cached = await _get_cached_overview(lookback_days)
+    if cached is not None:
+        return cached
+
+    now = datetime.now(UTC)
+    since = now - timedelta(days=lookback_days)
+    since_24h = now - timedelta(hours=24)
+
+    # One scan per table: every counter is a FILTERed aggregate over the same rows
+    users = (await db.execute(_USER_STATS, {"since": since, "since_24h": since_24h})).one()._mapping
+    orgs = (await db.execute(_ORG_STATS)).one()._mapping
+    projects = (await db.execute(_PROJECT_STATS, {"since_24h": since_24h})).one()._mapping
+    plan_counts = dict((await db.execute(_PLAN_COUNTS)).all())
+
+    total_projects = projects["total"]
+    failed_projects = projects["failed"]
+    # Derived from the aggregate row — no extra COUNT(FAILED) round-trip
+    failure_rate_pct = round(failed_projects / total_projects * 100, 1) if total_projects else 0.0
+
+    stats = {
+        "users": {
+            "total": users["total"],
+            "verified": users["verified"],
+            "active_last_30d": users["active"],
+            "new_last_30d": users["new"],
+        },
+        "orgs": {
+            "total": orgs["total"],
+            "active": orgs["active"],
+        },
+        "projects": {
+            "total": total_projects,
+            "completed": projects["completed"],
+            "failed": failed_projects,
+            "building_now": projects["building"],
+            "failure_rate_pct": failure_rate_pct,
+        },
+        "subscriptions": {
+            "total_active": users["subscribed"],
+            "by_plan": {plan: plan_counts.get(plan, 0) for plan in PLAN_NAMES},
+        },
+        "recent_activity": {
+            "new_users_24h": users["new_24h"],
+            "new_projects_24h": projects["new_24h"],
+        },
     }
 
-    stats["orgs"] = {
-        "total": await db.scalar(select(func.count(Org.id))),
-        "active": await db.scalar(select(func.count(Org.id)).where(Org.deleted_at.is_(None))),
-    }
-
-    total_projects = await db.scalar(select(func.count(Project.id)))
-    failed_projects = await db.scalar(select(func.count(Project.id)).where(Project.status == ProjectStatus.FAILED))
-    stats["projects"] = {
-        "total": total_projects,
-        "completed": await db.scalar(select(func.count(Project.id)).where(Project.status == ProjectStatus.COMPLETED)),
-        "failed": failed_projects,
-        "building_now": await db.scalar(select(func.count(Project.id)).where(Project.status == ProjectStatus.BUILDING)),
-        "failure_rate_pct": round(failed_projects / total_projects * 100, 1) if total_projects > 0 else 0.0,
-    }
-
-    stats["subscriptions"] = {
-        "total_active": await db.scalar(select(func.count(User.id)).where(User.subscription_status == "active")),
-        "by_plan": {
-            plan: await db.scalar(select(func.count(User.id)).where(User.plan == plan))
-            for plan in ["starter", "standard", "pro", "premier", "ultra"]
-        }
-    }
-
-    since_24h = datetime.now(ZoneInfo("UTC")) - timedelta(hours=24)
-    stats["recent_activity"] = {
-        "new_users_24h": await db.scalar(select(func.count(User.id)).where(User.created_at >= since_24h)),
-        "new_projects_24h": await db.scalar(select(func.count(Project.id)).where(Project.created_at >= since_24h)),
-    }
+    await _set_cached_overview(lookback_days, stats)
 
     return stats
 
@@ -114,7 +206,17 @@ async def get_recent_users(
     offset: int = Query(0, ge=0),
     search: Optional[str] = Query(None, description="Email or name partial match"),
 ):
-    stmt = select(User).order_by(desc(User.created_at))
+    # Project only the returned columns → plain row tuples, no ORM hydration
+    stmt = select(
+        User.id,
+        User.email,
+        User.name,
+        User.plan,
+        User.created_at,
+        User.is_verified,
+        User.credits,
+        User.subscription_status,
+    ).order_by(desc(User.created_at))
 
     if search:
         search = f"%{search}%"
@@ -123,21 +225,9 @@ async def get_recent_users(
     stmt = stmt.offset(offset).limit(limit)
 
     result = await db.execute(stmt)
-    users = result.scalars().all()
 
-    return [
-        {
-            "id": str(u.id),
-            "email": u.email,
-            "name": u.name,
-            "plan": u.plan,
-            "created_at": u.created_at.isoformat(),
-            "is_verified": u.is_verified,
-            "credits": u.credits,
-            "subscription_status": u.subscription_status,
-        }
-        for u in users
-    ]
+    # Row mappings keep raw UUID/datetime values — orjson serializes them natively
+    return ORJSONResponse([dict(u) for u in result.mappings()])
 
 
 # ────────────────────────────────────────────────
@@ -152,7 +242,16 @@ async def get_active_subscriptions(
     limit: int = Query(20, ge=5, le=100),
     offset: int = Query(0, ge=0),
 ):
-    stmt = select(User).where(User.subscription_status == status_filter)
+    # Project only the returned columns → plain row tuples, no ORM hydration
+    stmt = select(
+        User.id,
+        User.email,
+        User.plan,
+        User.stripe_subscription_id,
+        User.stripe_customer_id,
+        User.credits,
+        User.updated_at,
+    ).where(User.subscription_status == status_filter)
 
     if plan_filter:
         stmt = stmt.where(User.plan == plan_filter)
@@ -160,20 +259,19 @@ async def get_active_subscriptions(
     stmt = stmt.order_by(desc(User.updated_at)).offset(offset).limit(limit)
 
     result = await db.execute(stmt)
-    users = result.scalars().all()
 
-    return [
+    return ORJSONResponse([
         {
-            "user_id": str(u.id),
-            "email": u.email,
-            "plan": u.plan,
-            "subscription_id": u.stripe_subscription_id,
-            "customer_id": u.stripe_customer_id,
-            "credits": u.credits,
-            "updated_at": u.updated_at.isoformat(),
+            "user_id": u["id"],
+            "email": u["email"],
+            "plan": u["plan"],
+            "subscription_id": u["stripe_subscription_id"],
+            "customer_id": u["stripe_customer_id"],
+            "credits": u["credits"],
+            "updated_at": u["updated_at"],
         }
-        for u in users
-    ]
+        for u in result.mappings()
+    ])
 
 
 # ────────────────────────────────────────────────
@@ -187,7 +285,7 @@ async def get_failed_projects(
     limit: int = Query(20, ge=5, le=100),
     offset: int = Query(0, ge=0),
 ):
-    since = datetime.now(ZoneInfo("UTC")) - timedelta(days=days)
+    since = datetime.now(UTC) - timedelta(days=days)
 
     stmt = (
         select(Project)
@@ -201,18 +299,18 @@ async def get_failed_projects(
     result = await db.execute(stmt)
     projects = result.scalars().all()
 
-    return [
+    return ORJSONResponse([
         {
-            "id": str(p.id),
-            "user_id": str(p.user_id),
-            "org_id": str(p.org_id),
+            "id": p.id,
+            "user_id": p.user_id,
+            "org_id": p.org_id,
             "title": p.title,
             "prompt_preview": p.prompt[:120] + "..." if p.prompt else "",
             "error_message": p.error_message,
-            "created_at": p.created_at.isoformat(),
+            "created_at": p.created_at,
         }
         for p in projects
-    ]
+    ])
 
 
 # ────────────────────────────────────────────────
@@ -222,24 +320,33 @@ async def get_failed_projects(
 async def adjust_user_credits(
     current_user: CurrentAdminUser,
     db: DBSession,
+    background_tasks: BackgroundTasks,
     user_id: str,
     payload: CreditAdjust = Body(...),
 ):
-    target = await db.get(User, user_id)
-    if not target:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "User not found")
-
-    old_credits = target.credits
-    new_credits = old_credits + payload.amount
-
-    if new_credits < 0:
+    # Single atomic statement: no read-modify-write race between concurrent admins
+    row = (await db.execute(
+        update(User)
+        .where(User.id == user_id, (User.credits + payload.amount) >= 0)
+        .values(credits=User.credits + payload.amount)
+        .returning(User.credits, User.email)
+    )).first()
+
+    if row is None:
+        # Slow path only: distinguish missing user from a would-go-negative adjustment
+        if await db.scalar(select(User.id).where(User.id == user_id)) is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "User not found")
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Cannot reduce credits below zero")
 
-    target.credits = new_credits
+    new_credits, email = row
+    old_credits = new_credits - payload.amount
     await db.commit()
-    await db.refresh(target)
 
-    audit_log.delay(
+    await invalidate_overview_cache()
+
+    # Audit enqueue runs after the response is sent
+    background_tasks.add_task(
+        audit_log,
         user_id=current_user.id,
         action="admin_credit_adjust",
         metadata={
@@ -253,7 +360,7 @@ async def adjust_user_credits(
 
     return {
         "user_id": user_id,
-        "email": target.email,
+        "email": email,
         "old_credits": old_credits,
         "new_credits": new_credits,
         "adjustment": payload.amount,
@@ -267,9 +374,11 @@ async def adjust_user_credits(
 @router.post("/maintenance")
 async def toggle_maintenance_mode(
     current_user: CurrentAdminUser,
+    background_tasks: BackgroundTasks,
     payload: MaintenanceToggle = Body(...),
 ):
-    audit_log.delay(
+    background_tasks.add_task(
+        audit_log,
         user_id=current_user.id,
         action="maintenance_mode_toggle",
         metadata={"enabled": payload.enabled, "message": payload.message}
@@ -279,5 +388,5 @@ async def toggle_maintenance_mode(
         "status": "maintenance" if payload.enabled else "normal",
         "message": payload.message,
         "changed_by": current_user.email,
-        "timestamp": datetime.now(ZoneInfo("UTC")).isoformat()
+        "timestamp": datetime.now(UTC).isoformat()
     }
@@ -25,8 +25,6 @@ from fastapi import (
 )
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, Field
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from io import BytesIO
@@ -34,6 +32,7 @@ from base64 import b64encode
 from uuid import UUID
 
 from app.core.config import settings
+from app.core.rate_limit import limiter  # shared, Redis-backed (per user, else per IP)
 from app.core.security import create_access_token, create_refresh_token  # ← NEW: shared helpers
 from app.db.session import get_db
 from app.middleware.auth import get_current_user, AuthUser
@@ -45,17 +44,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-# ────────────────────────────────────────────────
-# Rate Limiter – per user when authenticated, else per IP
-# ────────────────────────────────────────────────
-def auth_limiter_key(request: Request) -> str:
-    user = getattr(request.state, "user", None)
-    if user and hasattr(user, "id"):
-        return str(user.id)
-    return get_remote_address()
-
-limiter = Limiter(key_func=auth_limiter_key)
-
 # ────────────────────────────────────────────────
 # Security & Config
 # ────────────────────────────────────────────────
@@ -105,6 +93,7 @@ class QRResponse(BaseModel):
 @limiter.limit("5/minute")
 async def signup(
     request: Request,
+    response: Response,  # slowapi injects X-RateLimit-* headers here
     background_tasks: BackgroundTasks,
     payload: SignupRequest,
     db: AsyncSession = Depends(get_db)
@@ -148,13 +137,13 @@ async def signup(
     """
 
     background_tasks.add_task(
-        send_email_task,
+        send_email_task.delay,
         to=user.email,
         subject="Verify Your CursorCode AI Account",
         html=html
     )
 
-    audit_log.delay(
+    audit_log(
         user_id=str(user.id),
         action="signup_attempt",
         metadata={"email": payload.email, "ip": request.client.host}
@@ -201,7 +190,7 @@ async def verify_email(
     response.set_cookie("access_token", access_token, **settings.COOKIE_DEFAULTS)
     response.set_cookie("refresh_token", refresh_token, **settings.COOKIE_DEFAULTS)
 
-    audit_log.delay(str(user.id), "email_verified", {"token_used": token})
+    audit_log(user_id=str(user.id), action="email_verified", metadata={"token_used": token})
 
     return {"message": "Email verified. You are now logged in."}
 
@@ -228,7 +217,7 @@ async def login(
     try:
         pwd_hasher.verify(user.hashed_password, form_data.password)
     except VerifyMismatchError:
-        audit_log.delay(None, "login_failed", {"email": form_data.username, "ip": request.client.host})
+        audit_log(user_id=None, action="login_failed", metadata={"email": form_data.username, "ip": request.client.host})
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
 
     if not user.is_verified:
@@ -241,7 +230,7 @@ async def login(
 
         totp = pyotp.TOTP(user.totp_secret)
         if not totp.verify(form_data.totp_code, valid_window=1):
-            audit_log.delay(str(user.id), "2fa_failed", {"ip": request.client.host})
+            audit_log(user_id=str(user.id), action="2fa_failed", metadata={"ip": request.client.host})
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid 2FA code")
 
     access_token = create_access_token({"sub": str(user.id), "email": user.email, "roles": user.roles})
@@ -250,10 +239,10 @@ async def login(
     response.set_cookie("access_token", access_token, **settings.COOKIE_DEFAULTS)
     response.set_cookie("refresh_token", refresh_token, **settings.COOKIE_DEFAULTS)
 
-    audit_log.delay(
-        str(user.id),
-        "login_success",
-        {"method": "password+2fa" if getattr(form_data, 'totp_code', None) else "password"}
+    audit_log(
+        user_id=str(user.id),
+        action="login_success",
+        metadata={"method": "password+2fa" if getattr(form_data, 'totp_code', None) else "password"}
     )
 
     return {"message": "Logged in successfully"}
@@ -266,6 +255,7 @@ async def login(
 @limiter.limit("3/minute")
 async def request_password_reset(
     request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
     payload: ResetRequest,
     db: AsyncSession = Depends(get_db)
@@ -298,13 +288,13 @@ async def request_password_reset(
     """
 
     background_tasks.add_task(
-        send_email_task,
+        send_email_task.delay,
         to=user.email,
         subject="Reset Your CursorCode AI Password",
         html=html
     )
 
-    audit_log.delay(str(user.id), "reset_password_requested", {"ip": request.client.host})
+    audit_log(user_id=str(user.id), action="reset_password_requested", metadata={"ip": request.client.host})
 
     return {"message": "If the email exists, a reset link has been sent."}
 
@@ -348,7 +338,7 @@ async def confirm_password_reset(
     response.set_cookie("access_token", access_token, **settings.COOKIE_DEFAULTS)
     response.set_cookie("refresh_token", refresh_token, **settings.COOKIE_DEFAULTS)
 
-    audit_log.delay(str(user.id), "password_reset_success", {})
+    audit_log(user_id=str(user.id), action="password_reset_success", metadata={})
 
     return {"message": "Password reset successful. You are now logged in."}
 
@@ -360,6 +350,7 @@ async def confirm_password_reset(
 @limiter.limit("5/minute")
 async def enable_2fa(
     request: Request,
+    response: Response,
     current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: AsyncSession = Depends(get_db)
 ):
@@ -393,7 +384,7 @@ async def enable_2fa(
     qr.save(buffered, format="PNG")
     qr_base64 = b64encode(buffered.getvalue()).decode("utf-8")
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="2fa_enabled",
         metadata={"ip": request.client.host}
@@ -410,6 +401,7 @@ async def enable_2fa(
 @limiter.limit("15/minute")
 async def verify_2fa_setup(
     request: Request,
+    response: Response,
     payload: Verify2FARequest,
     current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: AsyncSession = Depends(get_db)
@@ -423,7 +415,7 @@ async def verify_2fa_setup(
 
     totp = pyotp.TOTP(user.totp_secret)
     if not totp.verify(payload.code, valid_window=1):
-        audit_log.delay(
+        audit_log(
             user_id=current_user.id,
             action="2fa_verify_failed",
             metadata={"ip": request.client.host}
@@ -433,7 +425,7 @@ async def verify_2fa_setup(
     user.totp_enabled = True
     await db.commit()
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="2fa_verified_setup",
         metadata={"ip": request.client.host}
@@ -19,13 +19,12 @@ from fastapi import (
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from slowapi import Limiter
-
 import stripe
 from stripe.error import StripeError, InvalidRequestError
 
 from app.core.config import settings
 from app.core.enums import Plan  # ← NEW: import shared enum
+from app.core.rate_limit import limiter  # shared Redis-backed limiter (per user, fallback IP)
 from app.db.session import get_db
 from app.middleware.auth import get_current_user, AuthUser
 from app.db.models.user import User
@@ -42,15 +41,6 @@ router = APIRouter(prefix="/billing", tags=["Billing"])
 
 security = HTTPBearer(auto_error=False)
 
-# Rate limiter: per authenticated user
-def billing_limiter_key(request: Request) -> str:
-    user = getattr(request.state, "user", None)
-    if user and hasattr(user, "id"):
-        return str(user.id)
-    return request.client.host  # fallback
-
-limiter = Limiter(key_func=billing_limiter_key)
-
 stripe.api_key = settings.STRIPE_SECRET_KEY.get_secret_value()
 
 
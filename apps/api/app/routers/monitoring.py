@@ -6,26 +6,24 @@ Frontend error reporting, health checks.
 """
 
 import logging
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
-from fastapi import APIRouter, Request, Body, HTTPException, status
+from fastapi import APIRouter, Request, Response, Body, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from slowapi import Limiter
-
 from app.core.config import settings
-from app.core.deps import DBSession, OptionalCurrentUser, get_user_id_or_ip
+from app.core.deps import OptionalCurrentUser
+from app.core.rate_limit import limiter
+from app.services.error_log import enqueue_app_error
 from app.services.logging import audit_log
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"], default_response_class=ORJSONResponse)
 
-# Rate limiter: prefer user ID if authenticated, fallback to IP
-limiter = Limiter(key_func=get_user_id_or_ip)
+UTC = timezone.utc
 
 
 class FrontendErrorPayload(BaseModel):
@@ -42,7 +40,7 @@ class FrontendErrorPayload(BaseModel):
 @limiter.limit("20/minute")
 async def log_frontend_error(
     request: Request,              # required first
-    db: DBSession,                 # required next
+    response: Response,            # slowapi injects X-RateLimit-* headers here
     payload: FrontendErrorPayload = Body(...),  # default param last
     current_user: OptionalCurrentUser = None,  # optional last
 ):
@@ -55,49 +53,46 @@ async def log_frontend_error(
 
     user_id = current_user.id if current_user else None
     ip = request.client.host
-
-    logger.error(
-        "Frontend error received",
-        extra={
-            "message": message,
-            "url": url,
+    request_url = str(request.url)
+    stack_trunc = stack[:1000] if stack else None  # log-line copy; DB keeps the full stack
+
+    # "message" is a reserved LogRecord attribute — passing it in extra raises KeyError
+    log_extra = {
+        "error_message": message,
+        "url": url,
+        "component": component,
+        "stack": stack_trunc,
+        "user_agent": user_agent,
+        "source": source,
+        "user_id": user_id,
+        "ip": ip,
+        "environment": settings.ENVIRONMENT,
+        "request_path": request_url,
+        "request_method": request.method,
+    }
+    logger.error("Frontend error received", extra=log_extra)
+
+    # Buffered → written by the batch flusher (services/error_log.py); no DB round-trip here
+    enqueue_app_error({
+        "level": "frontend_error",
+        "message": message,
+        "stack": stack,
+        "user_id": user_id,
+        "request_path": url or request_url,
+        "request_method": "CLIENT_SIDE",
+        "environment": settings.ENVIRONMENT,
+        "extra": {
             "component": component,
-            "stack": stack[:1000] if stack else None,
             "user_agent": user_agent,
             "source": source,
-            "user_id": user_id,
             "ip": ip,
-            "environment": settings.ENVIRONMENT,
-            "request_path": str(request.url),
-            "request_method": request.method,
-        }
-    )
+            # Stack already lives in its own column — don't store it twice
+            "payload": payload.model_dump(mode="json", exclude={"stack"}, exclude_unset=True),
+            "timestamp": datetime.now(UTC).isoformat(),
+        },
+    })
 
-    try:
-        await db.execute(
-            insert("app_errors").values(
-                level="frontend_error",
-                message=message,
-                stack=stack,
-                user_id=user_id,
-                request_path=url or str(request.url),
-                request_method="CLIENT_SIDE",
-                environment=settings.ENVIRONMENT,
-                extra={
-                    "component": component,
-                    "user_agent": user_agent,
-                    "source": source,
-                    "ip": ip,
-                    "payload": payload.dict(exclude_unset=True),
-                    "timestamp": datetime.now(ZoneInfo("UTC")).isoformat(),
-                },
-            )
-        )
-        await db.commit()
-    except Exception as db_exc:
-        logger.error(f"Failed to store frontend error in DB: {db_exc}")
-
-    audit_log.delay(
+    audit_log(
         user_id=user_id,
         action="frontend_error_logged",
         metadata={
@@ -118,6 +113,6 @@ async def log_frontend_error(
 async def monitoring_health():
     return {
         "status": "healthy",
-        "timestamp": datetime.now(ZoneInfo("UTC")).isoformat(),
+        "timestamp": datetime.now(UTC).isoformat(),
         "service": "monitoring-router",
     }
@@ -22,10 +22,9 @@ from fastapi.security import HTTPBearer
 from pydantic import BaseModel, Field
 from sqlalchemy import select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.core.config import settings
+from app.core.rate_limit import limiter
 from app.db.session import get_db
 from app.middleware.auth import get_current_user, AuthUser, require_org_owner
 from app.db.models.user import User      # ← FIXED: correct path
@@ -38,9 +37,6 @@ router = APIRouter(prefix="/orgs", tags=["Organizations"])
 
 security = HTTPBearer(auto_error=False)
 
-# Rate limiter: 5 actions per minute per authenticated user
-limiter = Limiter(key_func=lambda r: r.state.user_id if hasattr(r.state, "user_id") else get_remote_address())
-
 
 class OrgCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=255, description="Organization name")
@@ -74,6 +70,7 @@ class OrgOut(BaseModel):
 @limiter.limit("3/minute")
 async def create_org(
     request: Request,
+    response: Response,  # slowapi injects X-RateLimit-* headers here
     payload: OrgCreate,
     current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: AsyncSession = Depends(get_db),
@@ -111,7 +108,7 @@ async def create_org(
     await db.refresh(org)
     await db.refresh(user)
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="org_created",
         metadata={
@@ -207,6 +204,7 @@ async def get_org(
 @limiter.limit("3/minute")
 async def update_org(
     request: Request,
+    response: Response,
     org_id: UUID,
     payload: OrgUpdate,
     current_user: Annotated[AuthUser, Depends(require_org_owner)],
@@ -237,7 +235,7 @@ async def update_org(
     await db.commit()
     await db.refresh(org)
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="org_updated",
         metadata={
@@ -284,7 +282,7 @@ async def delete_org(
     org.deleted_at = datetime.utcnow()
     await db.commit()
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="org_deleted",
         metadata={"org_id": str(org_id), "name": org.name},
@@ -302,6 +300,7 @@ async def delete_org(
 @limiter.limit("5/minute")
 async def switch_org(
     request: Request,
+    response: Response,
     org_id: UUID,
     current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: AsyncSession = Depends(get_db),
@@ -319,7 +318,7 @@ async def switch_org(
     # TODO: In future — issue new JWT with updated org_id claim
     # For now: just log the switch
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="org_switched",
         metadata={"new_org_id": str(org_id)},
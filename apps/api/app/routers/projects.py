@@ -25,10 +25,9 @@ from fastapi.security import HTTPBearer
 from pydantic import BaseModel, Field
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.core.config import settings
+from app.core.rate_limit import limiter
 from app.db.session import get_db
 from app.middleware.auth import get_current_user, AuthUser
 from app.db.models.project import Project, ProjectStatus  # correct path
@@ -43,9 +42,6 @@ router = APIRouter(prefix="/projects", tags=["Projects"])
 
 security = HTTPBearer(auto_error=False)
 
-# Rate limit: 5 projects per minute per user
-limiter = Limiter(key_func=lambda r: r.state.user_id if hasattr(r.state, "user_id") else get_remote_address())
-
 
 class ProjectCreate(BaseModel):
     prompt: str = Field(..., min_length=10, max_length=4000, description="Natural language description of the app")
@@ -81,6 +77,7 @@ class ProjectOut(BaseModel):
 @limiter.limit("5/minute")
 async def create_project(
     request: Request,
+    response: Response,  # slowapi injects X-RateLimit-* headers here
     payload: ProjectCreate,
     current_user: Annotated[AuthUser, Depends(get_current_user)],
     background_tasks: BackgroundTasks,
@@ -120,7 +117,7 @@ async def create_project(
         org_id=current_user.org_id,
     )
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="project_created",
         metadata={
@@ -258,7 +255,7 @@ async def update_project(
     await db.commit()
     await db.refresh(project)
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="project_updated",
         metadata={"project_id": str(project_id), "changes": payload.dict(exclude_unset=True)}
@@ -284,7 +281,7 @@ async def delete_project(
     project.deleted_at = datetime.utcnow()
     await db.commit()
 
-    audit_log.delay(
+    audit_log(
         user_id=current_user.id,
         action="project_deleted",
         metadata={"project_id": str(project_id)}
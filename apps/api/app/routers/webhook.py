@@ -9,11 +9,11 @@ import logging
 import time
 import uuid
 import hashlib
+from datetime import datetime, timezone
 from typing import Dict, Any
 
-from fastapi import APIRouter, Request, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Request, Response, HTTPException, status, BackgroundTasks
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
 from stripe.error import SignatureVerificationError, StripeError
 import stripe
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,7 +21,9 @@ from sqlalchemy import insert
 
 from app.core.config import settings
 from app.core.deps import DBSession
+from app.core.rate_limit import limiter
 from app.core.redis import get_redis_client  # ← Centralized Redis client
+from app.db.models.app_error import AppError
 from app.tasks.billing import (
     handle_checkout_session_completed_task,
     handle_invoice_paid_task,
@@ -48,9 +50,6 @@ DEBUG_PAYLOAD_TTL = 60 * 60 * 24        # 1 day for debug
 
 fernet = Fernet(settings.FERNET_KEY.get_secret_value())
 
-# Rate limiter: high burst for Stripe, per IP
-limiter = Limiter(key_func=lambda r: r.client.host)
-
 
 # ────────────────────────────────────────────────
 # Main Webhook Endpoint
@@ -59,6 +58,7 @@ limiter = Limiter(key_func=lambda r: r.client.host)
 @limiter.limit("200/minute")
 async def stripe_webhook(
     request: Request,
+    response: Response,  # slowapi injects X-RateLimit-* headers here
     background_tasks: BackgroundTasks,
     db: DBSession,
 ):
@@ -154,7 +154,7 @@ async def stripe_webhook(
                 logger.info(f"[{request_id}] Ignored webhook event: {event_type}")
 
             # Audit (queued)
-            await audit_log.delay(
+            audit_log(
                 user_id=data_object.get("customer"),
                 action="stripe_event_processed",
                 metadata={
@@ -194,7 +194,7 @@ async def stripe_webhook(
 async def _log_error_to_db(db: DBSession, request_id: str, message: str, stack: str | None = None):
     try:
         await db.execute(
-            insert("app_errors").values(
+            insert(AppError).values(
                 level="webhook_error",
                 message=message,
                 stack=stack,
@@ -5,18 +5,20 @@ Production-ready (2026): atomic transactions, idempotency, retries, audit trail.
 Uses dynamic Stripe Product + Price from 'plans' table (no manual IDs).
 """
 
+import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Tuple
 
 import stripe
-from sqlalchemy import select, update, insert
+from sqlalchemy import update, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
 from app.core.config import settings
 from app.db.models import Plan, User
+from app.db.models.plan import invalidate_plan_cache
 from app.services.logging import audit_log
 from app.tasks.email import send_email_task
 
@@ -24,6 +26,9 @@ logger = logging.getLogger(__name__)
 
 stripe.api_key = settings.STRIPE_SECRET_KEY.get_secret_value()
 
+# NOTE: the Stripe SDK is blocking (sync HTTP). Every call below runs via
+# asyncio.to_thread so the Stripe round-trip never stalls the event loop.
+
 
 # ────────────────────────────────────────────────
 # Plan Management (uses DB 'plans' table)
@@ -36,13 +41,13 @@ async def get_or_create_stripe_price(
     Get existing Stripe Price ID or create new Product + Price for the plan.
     Stores price ID in Supabase 'plans' table for future use.
     """
-    plan = await db.scalar(select(Plan).where(Plan.name == plan_name))
+    plan = await Plan.get_by_name(db, plan_name)
     if not plan:
         raise ValueError(f"Unknown plan: {plan_name}")
 
     if plan.stripe_price_id:
         try:
-            price = stripe.Price.retrieve(plan.stripe_price_id)
+            price = await asyncio.to_thread(stripe.Price.retrieve, plan.stripe_price_id)
             if price.unit_amount == plan.price_usd_cents:
                 return plan.stripe_price_id
         except stripe.error.InvalidRequestError as e:
@@ -50,7 +55,8 @@ async def get_or_create_stripe_price(
 
     try:
         # Create Product
-        product = stripe.Product.create(
+        product = await asyncio.to_thread(
+            stripe.Product.create,
             name=f"CursorCode {plan.display_name} Plan",
             description=f"{plan.display_name} plan with AI credits and priority support",
             metadata={"plan_name": plan_name},
@@ -58,7 +64,8 @@ async def get_or_create_stripe_price(
         )
 
         # Create recurring Price
-        price = stripe.Price.create(
+        price = await asyncio.to_thread(
+            stripe.Price.create,
             product=product.id,
             unit_amount=plan.price_usd_cents,
             currency="usd",
@@ -67,18 +74,21 @@ async def get_or_create_stripe_price(
             idempotency_key=f"price_{plan_name}_{uuid.uuid4()}",
         )
 
-        # Update DB
-        plan.stripe_product_id = product.id
-        plan.stripe_price_id = price.id
+        # Update DB via UPDATE (the Plan cache holds snapshots), then invalidate it
+        await db.execute(
+            update(Plan)
+            .where(Plan.id == plan.id)
+            .values(stripe_product_id=product.id, stripe_price_id=price.id)
+        )
         await db.commit()
-        await db.refresh(plan)
+        await invalidate_plan_cache()
 
         logger.info(f"Created new Stripe Price for {plan_name}: {price.id}")
         return price.id
 
     except stripe.error.StripeError as e:
         logger.error(f"Stripe price creation failed for {plan_name}: {e}")
-        await audit_log.delay(
+        audit_log(
             user_id=None,
             action="stripe_price_creation_failed",
             metadata={"plan_name": plan_name, "error": str(e)}
@@ -119,7 +129,7 @@ async def deduct_credits(
         new_credits, plan = row
         await db.commit()
 
-        audit_log.delay(
+        audit_log(
             user_id=user_id,
             action="credits_deducted",
             metadata={
@@ -186,7 +196,7 @@ async def refund_credits(
         new_credits = row[0]
         await db.commit()
 
-        audit_log.delay(
+        audit_log(
             user_id=user_id,
             action="credits_refunded",
             metadata={
@@ -217,13 +227,14 @@ async def create_or_get_stripe_customer(
     """
     if user.stripe_customer_id:
         try:
-            customer = stripe.Customer.retrieve(user.stripe_customer_id)
+            customer = await asyncio.to_thread(stripe.Customer.retrieve, user.stripe_customer_id)
             if customer.email == user.email:
                 return user.stripe_customer_id
         except stripe.error.InvalidRequestError as e:
             logger.warning(f"Stored customer ID invalid for user {user.id} – recreating: {e}")
 
-    customer = stripe.Customer.create(
+    customer = await asyncio.to_thread(
+        stripe.Customer.create,
         email=user.email,
         name=user.email.split("@")[0],
         metadata={"user_id": str(user.id)},
@@ -233,7 +244,7 @@ async def create_or_get_stripe_customer(
     user.stripe_customer_id = customer.id
     await db.commit()
 
-    audit_log.delay(
+    audit_log(
         user_id=str(user.id),
         action="stripe_customer_created",
         metadata={"customer_id": customer.id}
@@ -260,7 +271,8 @@ async def create_checkout_session(
 
     idempotency_key = f"checkout_{user.id}_{plan}_{uuid.uuid4()}"
 
-    session = stripe.checkout.Session.create(
+    session = await asyncio.to_thread(
+        stripe.checkout.Session.create,
         customer=customer_id,
         mode="subscription",
         payment_method_types=["card"],
@@ -275,7 +287,7 @@ async def create_checkout_session(
         idempotency_key=idempotency_key,
     )
 
-    audit_log.delay(
+    audit_log(
         user_id=str(user.id),
         action="checkout_session_created",
         metadata={
@@ -309,7 +321,8 @@ async def report_usage(
         return
 
     try:
-        stripe.billing.meter_events.create(
+        await asyncio.to_thread(
+            stripe.billing.meter_events.create,
             event_name="grok_tokens_used",
             value=tokens,
             identifier=f"{user_id}_{datetime.now(timezone.utc).timestamp()}",
@@ -322,7 +335,7 @@ async def report_usage(
             },
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=user_id,
             action="usage_reported",
             metadata={"tokens": tokens, "model": model}
@@ -330,14 +343,14 @@ async def report_usage(
 
     except StripeError as e:
         logger.error(f"Stripe usage report failed for user {user_id}: {e}")
-        await audit_log.delay(
+        audit_log(
             user_id=user_id,
             action="usage_report_failed",
             metadata={"error": str(e)}
         )
     except Exception as e:
         logger.exception(f"Usage reporting failed for user {user_id}")
-        await audit_log.delay(
+        audit_log(
             user_id=user_id,
             action="usage_report_failed",
             metadata={"error": str(e)}
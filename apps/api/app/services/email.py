@@ -77,7 +77,7 @@ async def send_email(
             extra={"message_id": response.get("id"), "provider": "resend"}
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=None,
             action="email_sent",
             metadata={
@@ -96,7 +96,7 @@ async def send_email(
 
     except resend.ResendError as e:
         logger.error(f"Resend API error: {e}")
-        audit_log.delay(
+        audit_log(
             user_id=None,
             action="email_failed",
             metadata={"to": to, "subject": subject, "error": str(e)},
@@ -104,7 +104,7 @@ async def send_email(
         raise HTTPException(status.HTTP_502_BAD_GATEWAY, "Email service unavailable")
     except Exception as e:
         logger.exception(f"Unexpected email send failure to {to}")
-        audit_log.delay(
+        audit_log(
             user_id=None,
             action="email_failed",
             metadata={"to": to, "subject": subject, "error": str(e)},
@@ -0,0 +1,96 @@
+"""
+Application Error Sink - CursorCode AI
+Buffers app_errors rows in-process and writes them with multi-row INSERTs.
+Keeps error-reporting endpoints O(1) under crash storms (one bad frontend deploy
+can send thousands of reports per minute).
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from app.db.models.app_error import AppError
+from app.db.session import async_session_factory
+from app.monitoring.metrics import frontend_errors_dropped_total
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAX_SIZE = 10_000
+FLUSH_BATCH_SIZE = 200
+FLUSH_INTERVAL_SECONDS = 0.25
+
+_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=QUEUE_MAX_SIZE)
+
+# Set by stop_app_error_flusher(); the flusher finishes its in-flight batch and returns
+_stopping = asyncio.Event()
+
+
+def enqueue_app_error(row: Dict[str, Any]) -> bool:
+    """
+    Queue one app_errors row (keys = AppError columns). Never blocks.
+    Returns False (and counts the drop) when the buffer is full.
+    """
+    try:
+        _queue.put_nowait(row)
+        return True
+    except asyncio.QueueFull:
+        frontend_errors_dropped_total.inc()
+        return False
+
+
+async def _flush(rows: List[Dict[str, Any]]) -> None:
+    try:
+        async with async_session_factory() as db:
+            await db.execute(insert(AppError), rows)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Failed to store {len(rows)} app errors in DB: {e}")
+
+
+async def run_app_error_flusher() -> None:
+    """
+    Background consumer (started in the app lifespan).
+    Flushes every FLUSH_BATCH_SIZE rows or FLUSH_INTERVAL_SECONDS, whichever comes first.
+    Stop it with stop_app_error_flusher(), not Task.cancel(): cancelling could drop
+    a batch that was dequeued but not yet committed.
+    """
+    loop = asyncio.get_running_loop()
+    while not _stopping.is_set():
+        try:
+            # Bounded wait so an idle flusher still notices _stopping
+            batch = [await asyncio.wait_for(_queue.get(), FLUSH_INTERVAL_SECONDS)]
+        except asyncio.TimeoutError:
+            continue
+        deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+        while len(batch) < FLUSH_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        await _flush(batch)
+
+
+async def stop_app_error_flusher(flusher: "asyncio.Task[None]", timeout: float = 10.0) -> None:
+    """Shutdown: let the flusher commit its in-flight batch, then drain what's still queued."""
+    _stopping.set()
+    try:
+        await asyncio.wait_for(flusher, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"app_errors flusher did not stop within {timeout}s; cancelled")
+    finally:
+        _stopping.clear()
+    await drain_app_errors()
+
+
+async def drain_app_errors() -> None:
+    """Flush whatever is still buffered (called by stop_app_error_flusher, once the flusher has exited)."""
+    rows: List[Dict[str, Any]] = []
+    while not _queue.empty():
+        rows.append(_queue.get_nowait())
+    if rows:
+        await _flush(rows)
@@ -1,86 +1,287 @@
 """
 Audit Logging Service - CursorCode AI
-Immutable, async, retryable audit trail for compliance & security.
+Immutable, batched, retryable audit trail for compliance & security.
 Logs all significant user actions (login, signup, 2FA, billing, project creation, etc.).
+
+audit_log_task routes to its own queue, consumed by a batching worker with unlimited
+prefetch (celery-batches needs a whole batch in flight to flush on size):
+    celery -A app.core.celery_app worker -Q audit --prefetch-multiplier=0 -c 4
+Email runs separately on the "emails" queue (see app/tasks/email.py), so a slow
+Resend call never holds audit messages behind it.
 """
 
-import json
+import io
 import logging
+import queue
+import random
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Set
 
+import orjson
 from celery import shared_task
+from celery.signals import worker_process_init
+from celery_batches import Batches
 from fastapi import Request
-from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DataError, IntegrityError
 
-from app.db.session import async_session_factory
-from app.db.models.audit import AuditLog
+from app.core.config import settings
+from app.core.retry import requeue_batch
+from app.db.session import sync_engine
+from app.db.models.audit import AuditLog, UserAgent, hash_user_agent
+from app.middleware.audit import AuditContext
 
 logger = logging.getLogger(__name__)
 
+# UA hashes already present in 'user_agents' (per worker process)
+_known_user_agents: Set[int] = set()
+
+AUDIT_QUEUE = "audit"
+
+# Sampling applies only to these high-volume actions; everything else is always recorded
+_SAMPLED_ACTIONS = frozenset(settings.AUDIT_SAMPLED_ACTIONS)
+_SAMPLE_RATE = settings.AUDIT_SAMPLE_RATE
+
+# Batch sizing — the worker's prefetch window (prefetch_multiplier * concurrency)
+# must hold at least AUDIT_FLUSH_EVERY messages, or batches only flush on the timer
+# (--prefetch-multiplier=0 on the audit worker removes the cap)
+AUDIT_FLUSH_EVERY = 200
+AUDIT_FLUSH_INTERVAL = 2.0  # seconds
+
+
+# ────────────────────────────────────────────────
+# Bulk write: COPY into a staging table, then merge
+# ────────────────────────────────────────────────
+class _AuditRecord(NamedTuple):
+    """One audit row, in _COPY_COLUMNS order."""
+    event_id: Optional[str]
+    user_id: Optional[str]
+    action: str
+    event_metadata: str             # JSON text
+    ip_address: Optional[str]
+    user_agent_hash: Optional[int]
+    request_id: Optional[str]
+
+
+_COPY_COLUMNS = ", ".join(_AuditRecord._fields)
+
+# Dropped at commit, so it never outlives the transaction (safe behind the transaction pooler)
+_STAGE_DDL = (
+    "CREATE TEMP TABLE audit_logs_stage ("
+    "event_id uuid, user_id uuid, action varchar(100), event_metadata jsonb, "
+    "ip_address varchar(45), user_agent_hash bigint, request_id varchar(36)"
+    ") ON COMMIT DROP"
+)
+_COPY_SQL = f"COPY audit_logs_stage ({_COPY_COLUMNS}) FROM STDIN"
+
+# COPY can't upsert, so the merge keeps the event_id idempotency: missing IDs are
+# DB-generated, redelivered events (acks_late crash between commit and ack) are no-ops.
+# A user_id with no users row (deleted, or never a user) is stored as NULL with the
+# raw ID kept in metadata, so it can't trip the FK and fail the whole batch
+_MERGE_SQL = (
+    f"INSERT INTO {AuditLog.__tablename__} ({_COPY_COLUMNS}) "
+    "SELECT COALESCE(s.event_id, gen_random_uuid()), u.id, s.action, "
+    "CASE WHEN s.user_id IS NOT NULL AND u.id IS NULL "
+    "THEN s.event_metadata || jsonb_build_object('raw_user_id', s.user_id) "
+    "ELSE s.event_metadata END, "
+    "s.ip_address, s.user_agent_hash, s.request_id FROM audit_logs_stage s "
+    "LEFT JOIN users u ON u.id = s.user_id "
+    "ON CONFLICT (event_id) DO NOTHING"
+)
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value for COPY's text format."""
+    return "\\N" if value is None else str(value).translate(_COPY_ESCAPES)
+
+
+@worker_process_init.connect
+def _reset_engine_after_fork(**_):
+    """Each prefork child gets a fresh pool instead of the parent's inherited sockets."""
+    sync_engine.dispose(close=False)
+    # Threads don't survive fork: each child starts its own batcher
+    start_audit_batcher()
+
+
+def _write_audit_batch(records: List[_AuditRecord], new_user_agents: Dict[int, str]) -> None:
+    """COPY one batch of audit rows (plus any unseen user agents) in a single transaction."""
+    data = io.StringIO("".join("\t".join(map(_copy_field, record)) + "\n" for record in records))
+
+    with sync_engine.begin() as conn:
+        if new_user_agents:
+            conn.execute(
+                pg_insert(UserAgent)
+                .values([{"hash": h, "user_agent": ua} for h, ua in new_user_agents.items()])
+                .on_conflict_do_nothing(index_elements=["hash"])
+            )
+        # One COPY stream: no per-row parse/plan or bind parameters
+        conn.exec_driver_sql(_STAGE_DDL)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(_COPY_SQL, data)
+        conn.exec_driver_sql(_MERGE_SQL)
+
 
 @shared_task(
+    base=Batches,
     name="app.tasks.logging.audit_log",
-    bind=True,
+    queue=AUDIT_QUEUE,
+    serializer="msgpack",         # this task only; re-queued batches inherit it
+    flush_every=AUDIT_FLUSH_EVERY,
+    flush_interval=AUDIT_FLUSH_INTERVAL,
     max_retries=5,
     default_retry_delay=30,       # seconds
-    retry_backoff=True,
-    retry_jitter=True,
     acks_late=True,
+    ignore_result=True,
 )
-async def audit_log_task(
-    self,
-    action: str,                        # required - first
-    user_id: Optional[str] = None,
-    metadata: Optional[Dict[str, Any]] = None,
-    ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None,
-    request_id: Optional[str] = None,
-    event_id: Optional[str] = None,     # for deduplication / tracing
-):
+def audit_log_task(requests):
     """
-    Celery async task: Create immutable audit log entry.
-    Retries on DB failure, ensures delivery.
+    Celery batch task: bulk-load buffered audit entries with one COPY.
+    Each request carries the audit_log() kwargs; only the events that fail
+    are re-queued (see _write_requests).
+    Messages stay unacked until their batch commits, so nothing is lost in
+    the buffer on a worker crash (they are redelivered instead).
     """
-    if event_id is None:
-        event_id = str(uuid.uuid4())
+    failed = _write_requests(requests)
+    if failed:
+        requeue_batch(audit_log_task, failed)
 
-    if metadata is None:
-        metadata = {}
 
+def _write_requests(requests: List[Any]) -> List[Any]:
+    """
+    Write a batch of audit requests; returns the ones that could not be written.
+    A data error (one bad row fails the whole COPY) bisects the batch so the
+    good events still land and only the poison one is retried until dropped.
+    Anything else (connection lost, DB down) fails the whole batch as-is.
+    """
     try:
-        async with async_session_factory() as db:
-            stmt = insert(AuditLog).values(
-                event_id=event_id,
-                user_id=user_id,
-                action=action,
-                event_metadata=metadata,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_id=request_id,
-                created_at=datetime.now(timezone.utc),
-            )
-            await db.execute(stmt)
-            await db.commit()
+        _write_events([req.kwargs for req in requests])
+        return []
+    except (DataError, IntegrityError):
+        if len(requests) == 1:
+            logger.exception(f"Audit event rejected: {requests[0].kwargs.get('action')}")
+            return list(requests)
+        mid = len(requests) // 2
+        return _write_requests(requests[:mid]) + _write_requests(requests[mid:])
+    except Exception:
+        logger.exception(f"Audit batch of {len(requests)} events failed")
+        return list(requests)
+
+
+def _write_events(events: List[Dict[str, Any]]) -> None:
+    """Write one batch of audit_log() events and log each; raises if the write fails."""
+    records: List[_AuditRecord] = []
+    new_user_agents: Dict[int, str] = {}
+
+    for event in events:
+        user_agent = event.get("user_agent")
+        ua_hash = hash_user_agent(user_agent) if user_agent else None
+        if ua_hash is not None and ua_hash not in _known_user_agents:
+            new_user_agents[ua_hash] = user_agent
 
+        # created_at is left to the server default; metadata JSON is encoded
+        # once and shared by the COPY stream and the log line
+        records.append(_AuditRecord(
+            event_id=event.get("event_id"),
+            user_id=event.get("user_id"),
+            action=event["action"],
+            event_metadata=orjson.dumps(event.get("metadata") or {}, default=str).decode(),
+            ip_address=event.get("ip_address"),
+            user_agent_hash=ua_hash,
+            request_id=event.get("request_id"),
+        ))
+
+    _write_audit_batch(records, new_user_agents)
+    _known_user_agents.update(new_user_agents)
+
+    for event, record in zip(events, records):
         logger.info(
-            f"AUDIT [{event_id}]: {action}",
+            f"AUDIT [{record.event_id}]: {record.action}",
             extra={
-                "user_id": user_id,
-                "metadata": json.dumps(metadata, default=str),
-                "ip": ip_address,
-                "user_agent": user_agent,
-                "request_id": request_id,
+                "user_id": record.user_id,
+                "metadata": record.event_metadata,
+                "ip": record.ip_address,
+                "user_agent": event.get("user_agent"),
+                "request_id": record.request_id,
             }
         )
 
-    except Exception as exc:
-        logger.exception(
-            f"Audit log failed for action '{action}' (event_id={event_id})",
-            extra={"exc_info": str(exc)}
-        )
-        raise self.retry(exc=exc)
+
+# ────────────────────────────────────────────────
+# In-process batcher (AUDIT_INPROC)
+# ────────────────────────────────────────────────
+class _AuditBatcher(threading.Thread):
+    """
+    Daemon thread that batches audit events produced in this process and writes
+    them through the same COPY path as the Celery task — no serialize/broker/
+    deserialize hop. A failed batch falls back to the Celery queue.
+    """
+
+    _STOP = object()
+
+    def __init__(self) -> None:
+        super().__init__(name="audit-batcher", daemon=True)
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+
+    def submit(self, event: Dict[str, Any]) -> None:
+        self._queue.put(event)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush whatever is buffered, then end the thread."""
+        self._queue.put(self._STOP)
+        self.join(timeout)
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+            while len(batch) < AUDIT_FLUSH_EVERY:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    @staticmethod
+    def _flush(batch: List[Dict[str, Any]]) -> None:
+        try:
+            _write_events(batch)
+        except Exception:
+            logger.exception(f"In-process audit batch of {len(batch)} events failed; re-queuing via Celery")
+            for event in batch:
+                audit_log_task.apply_async(kwargs=event, compression="zstd")
+
+
+_audit_batcher: Optional[_AuditBatcher] = None
+
+
+def start_audit_batcher() -> None:
+    """Start this process's in-process batcher when AUDIT_INPROC is enabled."""
+    global _audit_batcher
+    if settings.AUDIT_INPROC and _audit_batcher is None:
+        _audit_batcher = _AuditBatcher()
+        _audit_batcher.start()
+
+
+def stop_audit_batcher() -> None:
+    global _audit_batcher
+    if _audit_batcher is not None:
+        _audit_batcher.stop()
+        _audit_batcher = None
 
 
 # ────────────────────────────────────────────────
@@ -92,35 +293,64 @@ def audit_log(
     metadata: Optional[Dict[str, Any]] = None,
     request: Optional[Request] = None,
     event_id: Optional[str] = None,
+    ctx: Optional[AuditContext] = None,
 ):
     """
-    Convenience sync caller: queues the Celery audit task.
+    Convenience sync caller: queues the Celery audit task, or hands the event
+    to this process's batcher when AUDIT_INPROC is enabled.
     Use in middleware, routes, or services.
 
     Args:
         action: Descriptive action name (e.g. "login_success", "project_created")
-        user_id: Authenticated user ID (str)
+        user_id: Authenticated user ID (UUID; anything else is kept as metadata["raw_user_id"])
         metadata: Optional dict of context (will be JSON-serialized)
         request: FastAPI Request (for IP, user-agent, request ID)
         event_id: Optional external trace ID (for correlation)
+        ctx: Pre-extracted (ip, user_agent, request_id); takes precedence over request
     """
-    ip = request.client.host if request else None
-    ua = request.headers.get("user-agent") if request else None
-    req_id = request.headers.get("X-Request-ID") if request else None
-
-    # Optional: truncate very large metadata to prevent DB bloat
-    if metadata and len(json.dumps(metadata)) > 100_000:
-        metadata = {"truncated": True, "original_size": len(json.dumps(metadata))}
-
-    audit_log_task.delay(
-        action=action,
-        user_id=user_id,
-        metadata=metadata,
-        ip_address=ip,
-        user_agent=ua,
-        request_id=req_id,
-        event_id=event_id,
-    )
+    # Dropped events cost nothing: no header reads, no serialization, no broker write
+    if action in _SAMPLED_ACTIONS and random.random() >= _SAMPLE_RATE:
+        return
+
+    if ctx is None and request is not None:
+        # Set once per request by AuditContextMiddleware
+        ctx = getattr(request.state, "audit_ctx", None) or AuditContext.from_request(request)
+    ip, ua, req_id = ctx if ctx is not None else (None, None, None)
+
+    # Optional: truncate very large metadata to prevent DB bloat (serialize once, in C)
+    if metadata:
+        encoded = orjson.dumps(metadata, default=str)
+        if len(encoded) > 100_000:
+            metadata = {"truncated": True, "original_size": len(encoded)}
+        else:
+            # msgpack has no UUID/datetime encoders — reuse the JSON-safe form
+            metadata = orjson.loads(encoded)
+
+    # audit_logs.user_id is a uuid FK: anything else (e.g. a Stripe "cus_..." ID)
+    # is stored as NULL and kept in metadata, instead of failing the batch COPY
+    if user_id is not None:
+        try:
+            user_id = str(uuid.UUID(str(user_id)))
+        except ValueError:
+            metadata = {**(metadata or {}), "raw_user_id": str(user_id)}
+            user_id = None
+
+    event = {
+        # Generated here, not in the worker, so a redelivered message keeps its ID
+        "event_id": event_id or str(uuid.uuid4()),
+        "action": action,
+        "user_id": user_id,
+        "metadata": metadata,
+        "ip_address": ip,
+        "user_agent": ua,
+        "request_id": req_id,
+    }
+
+    if _audit_batcher is not None:
+        _audit_batcher.submit(event)
+        return
+
+    audit_log_task.apply_async(kwargs=event, compression="zstd")
 
 
 # ────────────────────────────────────────────────
@@ -64,15 +64,15 @@ def handle_checkout_session_completed_task(
         user.subscription_status = "active"
         user.updated_at = datetime.now(timezone.utc)
 
+        # expire_on_commit=False: every field logged below is already in memory
         await db.commit()
-        await db.refresh(user)
 
         logger.info(
             f"Activated subscription {subscription_id} for user {user.id}",
             extra={"plan": plan, "credits_added": settings.STRIPE_PLAN_CREDITS.get(plan, 75)}
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=str(user.id),
             action=action,
             metadata=metadata
@@ -140,7 +140,7 @@ def handle_invoice_paid_task(
             extra={"subscription_id": subscription_id}
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=str(user.id),
             action=action,
             metadata=metadata
@@ -200,7 +200,7 @@ def handle_invoice_payment_failed_task(
             extra={"subscription_id": subscription_id}
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=str(user.id),
             action=action,
             metadata=metadata
@@ -269,7 +269,7 @@ def handle_invoice_payment_succeeded_task(
             extra={"subscription_id": subscription_id}
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=str(user.id),
             action=action,
             metadata=metadata
@@ -330,7 +330,7 @@ def handle_subscription_updated_task(
             f"Subscription {subscription_id} updated to {new_status} for user {user.id}"
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=str(user.id),
             action=action,
             metadata=metadata
@@ -399,7 +399,7 @@ def handle_subscription_deleted_task(
             """
         )
 
-        audit_log.delay(
+        audit_log(
             user_id=str(user.id),
             action=action,
             metadata=metadata
@@ -2,151 +2,269 @@
 """
 Celery email sending tasks for CursorCode AI
 Uses Resend (modern, reliable email API) instead of SendGrid.
+Emails are coalesced with celery-batches and posted through Resend's batch endpoint.
+
+The task is pure network I/O and routes to its own queue, served by a green-thread pool:
+    celery -A app.core.celery_app worker -Q emails -P gevent -c 500 --prefetch-multiplier=1
+(-P gevent makes Celery monkey-patch sockets before any task module is imported.)
+Audit events go to the separate "audit" queue (see app/services/logging.py), so
+neither task's prefetch window can starve the other.
 """
 
+import hashlib
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Tuple
 
-import resend
+import httpx
 from celery import shared_task
+from celery_batches import Batches
+from redis import Redis, RedisError
 
 from app.core.config import settings
+from app.core.retry import full_jitter_countdown, requeue_batch
 from app.services.logging import audit_log
 
 logger = logging.getLogger(__name__)
 
-# Set Resend API key once (from settings)
-resend.api_key = settings.RESEND_API_KEY.get_secret_value()
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
 
+# Transient batch failures are retried in-task this many times under the same
+# Idempotency-Key before the emails are re-queued
+RESEND_BATCH_ATTEMPTS = 3
+RESEND_RETRY_BASE = 1.0  # seconds (full jitter)
 
-@shared_task(
-    bind=True,
-    name="app.tasks.email.send_email",
-    max_retries=3,
-    default_retry_delay=60,          # initial delay
-    retry_backoff=True,              # exponential backoff
-    retry_jitter=True,               # random jitter to avoid thundering herd
-    acks_late=True,                  # only ack after task completes
+EMAIL_QUEUE = "emails"
+
+# Read once: skips the pydantic settings attribute lookup per email
+_DEFAULT_FROM = settings.EMAIL_FROM
+
+# ────────────────────────────────────────────────
+# Shared Resend quota (token bucket in Redis)
+# ────────────────────────────────────────────────
+# Celery's rate_limit is per worker and doesn't apply to batch flushes; one bucket
+# in Redis covers every worker, so bursts queue here instead of drawing 429s
+RESEND_BUCKET_KEY = "ratelimit:resend"
+RESEND_BUCKET_CAPACITY = 2  # burst size
+
+# Refills at ARGV[1] tokens/s up to ARGV[2]; takes one token and returns 0,
+# or returns the milliseconds until one is available. Uses the Redis clock so
+# worker clock skew doesn't matter
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+_redis = Redis.from_url(str(settings.REDIS_URL), socket_timeout=5)
+_take_resend_token = _redis.register_script(_TOKEN_BUCKET_LUA)
+
+
+def _wait_for_resend_token() -> None:
+    """Block until the shared bucket grants one Resend request; fail open if Redis is down."""
+    try:
+        while True:
+            wait_ms = _take_resend_token(
+                keys=[RESEND_BUCKET_KEY],
+                args=[settings.RESEND_REQUESTS_PER_SECOND, RESEND_BUCKET_CAPACITY],
+            )
+            if not wait_ms:
+                return
+            time.sleep(wait_ms / 1000)  # cooperative under the gevent pool
+    except RedisError as e:
+        logger.warning(f"Resend rate limiter unavailable, sending unthrottled: {e}")
+
+# One pooled client per worker process: keep-alive reuses TCP + TLS sessions across
+# flushes (the resend SDK issues a bare requests.request() per call)
+_http = httpx.Client(
+    headers={"Authorization": f"Bearer {settings.RESEND_API_KEY.get_secret_value()}"},
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=50),
+    timeout=30.0,
 )
-def send_email_task(
-    self,
-    to: str,
-    subject: str,
-    html: str,
-    from_email: Optional[str] = None,
-    reply_to: Optional[str] = None,
-    cc: Optional[list[str]] = None,
-    bcc: Optional[list[str]] = None,
-    metadata: Optional[Dict[str, Any]] = None,
-) -> Optional[str]:
-    """
-    Celery task to send a single email via Resend.
-
-    Retries up to 3 times on failure with exponential backoff + jitter.
-    Logs success/failure and audits the event.
-
-    Args:
-        to: Recipient email address
-        subject: Email subject line
-        html: Full HTML body content
-        from_email: Optional override sender (defaults to settings.EMAIL_FROM)
-        reply_to: Optional Reply-To header
-        cc: Optional list of CC recipients
-        bcc: Optional list of BCC recipients
-        metadata: Optional dict for audit/logging context
-
-    Returns:
-        Resend message ID on success, None on final failure after retries
-    """
-    sender = from_email or settings.EMAIL_FROM
 
+# Resend's batch endpoint accepts at most 100 emails per call. As with the audit
+# batches, the worker's prefetch window must hold a full batch
+EMAIL_FLUSH_EVERY = 100
+EMAIL_FLUSH_INTERVAL = 5.0  # seconds
+
+
+def _to_resend_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape one queued send_email_task call into a Resend email payload."""
+    to = kwargs["to"]
     params = {
-        "from": sender,
-        "to": [to],
-        "subject": subject,
-        "html": html,
+        # services/email.py queues the Resend-shaped "from" key
+        "from": kwargs.get("from_email") or kwargs.get("from") or _DEFAULT_FROM,
+        "to": [to] if isinstance(to, str) else to,
+        "subject": kwargs["subject"],
     }
 
-    if reply_to:
-        params["reply_to"] = reply_to
-    if cc:
-        params["cc"] = cc
-    if bcc:
-        params["bcc"] = bcc
+    if kwargs.get("html"):
+        params["html"] = kwargs["html"]
+    elif kwargs.get("text"):
+        params["text"] = kwargs["text"]
 
-    try:
-        response = resend.Emails.send(params)
+    for key in ("reply_to", "cc", "bcc"):
+        if kwargs.get(key):
+            params[key] = kwargs[key]
 
-        message_id = response.get("id")
+    return params
 
-        logger.info(
-            f"Email sent successfully",
-            extra={
-                "to": to,
-                "subject": subject,
-                "message_id": message_id,
-                "provider": "resend",
-                "metadata": metadata or {},
-            }
-        )
 
-        audit_log.delay(
-            user_id=None,
-            action="email_sent",
-            metadata={
-                "to": to,
-                "subject": subject,
-                "message_id": message_id,
-                "status": "success",
-                "provider": "resend",
-                **(metadata or {}),
-            }
-        )
+def _post(url: str, payload: Any, idempotency_key: str) -> Dict[str, Any]:
+    """POST to Resend over the pooled client (one quota token); raises on non-2xx."""
+    _wait_for_resend_token()
+    # Resend replays the original response for a key it has seen (24h), so a retry
+    # after a timeout on an accepted request doesn't send the emails twice
+    response = _http.post(url, json=payload, headers={"Idempotency-Key": idempotency_key})
+    response.raise_for_status()
+    return response.json()
 
-        return message_id
 
-    except resend.ResendError as e:
-        error_detail = str(e)
-        logger.error(
-            f"Resend API error sending email to {to}",
-            extra={
-                "subject": subject,
-                "error": error_detail,
-                "metadata": metadata or {},
-            },
-            exc_info=True
-        )
+def _batch_idempotency_key(requests: List[Any]) -> str:
+    """Stable key for one batch: derived from its Celery request IDs, not the attempt."""
+    digest = hashlib.sha256("\n".join(sorted(req.id for req in requests)).encode())
+    return f"batch/{digest.hexdigest()}"
 
-        audit_log.delay(
-            user_id=None,
-            action="email_failed",
-            metadata={
-                "to": to,
-                "subject": subject,
-                "error": error_detail,
-                "provider": "resend",
-                **(metadata or {}),
-            }
-        )
 
-        raise self.retry(exc=e)
+def _post_batch(requests: List[Any], params: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """POST one batch, retrying transient failures in-task with the same Idempotency-Key."""
+    idempotency_key = _batch_idempotency_key(requests)
+    for attempt in range(RESEND_BATCH_ATTEMPTS):
+        try:
+            return _post(RESEND_BATCH_URL, params, idempotency_key)
+        except Exception as exc:
+            if attempt == RESEND_BATCH_ATTEMPTS - 1 or not _is_retryable(exc):
+                raise
+            time.sleep(full_jitter_countdown(RESEND_RETRY_BASE, attempt))  # cooperative under gevent
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Only 4xx responses other than 408/429 are permanent; everything else may pass later."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status in (408, 429) or status >= 500
+    return True
+
+
+def _send_individually(
+    requests: List[Any],
+    params: List[Dict[str, Any]],
+) -> Tuple[List[Tuple[Optional[str], Optional[str]]], List[Any]]:
+    """
+    Fallback after a permanently rejected batch: send each email on its own.
+    Returns (message_id, error) per email, plus the requests worth retrying.
+    """
+    outcomes: List[Tuple[Optional[str], Optional[str]]] = []
+    to_retry: List[Any] = []
+
+    for req, payload in zip(requests, params):
+        try:
+            outcomes.append((_post(RESEND_EMAILS_URL, payload, f"email/{req.id}").get("id"), None))
+        except Exception as exc:
+            outcomes.append((None, str(exc)))
+            if _is_retryable(exc):
+                to_retry.append(req)
+            else:
+                logger.error(
+                    f"Resend rejected email to {req.kwargs['to']}",
+                    extra={"error": str(exc), "provider": "resend"}
+                )
+
+    return outcomes, to_retry
+
+
+@shared_task(
+    base=Batches,
+    name="app.tasks.email.send_email",
+    queue=EMAIL_QUEUE,
+    serializer="msgpack",            # this task only (kwargs are plain str/list)
+    flush_every=EMAIL_FLUSH_EVERY,
+    flush_interval=EMAIL_FLUSH_INTERVAL,
+    max_retries=3,
+    default_retry_delay=60,          # backoff base (full jitter, see requeue_batch)
+    acks_late=True,                  # only ack after task completes
+    ignore_result=True,
+)
+def send_email_task(requests) -> None:
+    """
+    Celery batch task: send buffered emails via one Resend batch call.
+
+    Each request carries the usual single-email kwargs:
+        to, subject, html (or text), from_email, reply_to, cc, bcc, metadata
+
+    Transient failures (429, 5xx, network) are retried in-task under one
+    Idempotency-Key, then re-queue the batch per email with full-jitter
+    backoff (up to 3 retries). A permanent 4xx falls back to
+    single sends, so only the rejected emails fail. Logs success/failure and
+    audits every email.
+    """
+    params = [_to_resend_params(req.kwargs) for req in requests]
+    outcomes: List[Tuple[Optional[str], Optional[str]]]  # (message_id, error) per email
+    to_retry: List[Any] = []
+
+    try:
+        response = _post_batch(requests, params)
+        # Resend returns one {"id": ...} per email, in request order
+        message_ids = [result.get("id") for result in response.get("data") or []]
+        message_ids += [None] * (len(requests) - len(message_ids))
+        outcomes = [(message_id, None) for message_id in message_ids]
 
     except Exception as exc:
         logger.exception(
-            f"Unexpected failure sending email to {to}",
-            extra={"subject": subject, "metadata": metadata or {}}
+            f"Resend batch of {len(params)} emails failed",
+            extra={"error": str(exc), "provider": "resend"}
         )
+        if _is_retryable(exc):
+            outcomes = [(None, str(exc))] * len(requests)
+            to_retry = list(requests)
+        else:
+            # Resend rejects the whole batch for one invalid email — send singly so
+            # only the rejected ones fail
+            outcomes, to_retry = _send_individually(requests, params)
+
+    # Exactly one audit event per email, success or failure
+    for req, (message_id, error) in zip(requests, outcomes):
+        metadata = req.kwargs.get("metadata") or {}
 
-        audit_log.delay(
-            user_id=None,
-            action="email_failed",
+        if error is None:
+            logger.info(
+                f"Email sent successfully",
+                extra={
+                    "to": req.kwargs["to"],
+                    "subject": req.kwargs["subject"],
+                    "message_id": message_id,
+                    "provider": "resend",
+                    "metadata": metadata,
+                }
+            )
+
+        audit_log(
+            action="email_failed" if error else "email_sent",
             metadata={
-                "to": to,
-                "subject": subject,
-                "error": str(exc),
+                "to": req.kwargs["to"],
+                "subject": req.kwargs["subject"],
                 "provider": "resend",
-                **(metadata or {}),
-            }
+                "status": "failed" if error else "success",
+                "message_id": message_id,
+                "error": error,
+                **metadata,
+            },
         )
 
-        raise self.retry(exc=exc)
+    if to_retry:
+        requeue_batch(send_email_task, to_retry)
@@ -109,7 +109,7 @@ def report_grok_usage(
                 }
             )
 
-            audit_log.delay(
+            audit_log(
                 user_id=user_id,
                 action="grok_usage_reported",
                 metadata={
@@ -193,7 +193,7 @@ def batch_report_daily_usage(self, user_id: Optional[str] = None):
                     extra={"model": model, "customer_id": customer_id}
                 )
 
-                audit_log.delay(
+                audit_log(
                     user_id=user_id,
                     action="batch_usage_reported",
                     metadata={
@@ -0,0 +1,74 @@
+"""
+Audit batches: one bad event must not fail (and keep re-failing) the whole batch.
+The DB write is stubbed; nothing here connects to Postgres or the broker.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DataError
+
+from app.services import logging as audit
+
+GOOD_USER = "0b7e0c7e-3f5e-4a55-9d0e-6f1f1b1c2d3e"
+
+
+def _request(user_id):
+    return SimpleNamespace(kwargs={"action": "test_event", "user_id": user_id})
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Stub the COPY path: any batch containing a 'bad' user_id fails as Postgres would."""
+    rows = []
+
+    def fake_write_events(events):
+        if any(event["user_id"] == "bad" for event in events):
+            raise DataError("COPY audit_logs_stage", {}, Exception("invalid input syntax for type uuid"))
+        rows.extend(events)
+
+    monkeypatch.setattr(audit, "_write_events", fake_write_events)
+    return rows
+
+
+def test_mixed_batch_writes_good_events_and_isolates_bad_one(written):
+    requests = [_request(GOOD_USER) for _ in range(6)] + [_request("bad")] + [_request(None)]
+
+    failed = audit._write_requests(requests)
+
+    assert [req.kwargs["user_id"] for req in failed] == ["bad"]
+    assert len(written) == 7
+
+
+def test_connection_error_fails_whole_batch(monkeypatch):
+    def down(events):
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(audit, "_write_events", down)
+    requests = [_request(GOOD_USER) for _ in range(4)]
+
+    assert audit._write_requests(requests) == requests
+
+
+def test_task_requeues_only_failed_requests(monkeypatch, written):
+    requeued = []
+    monkeypatch.setattr(audit, "requeue_batch", lambda task, requests: requeued.extend(requests))
+
+    audit.audit_log_task.run([_request(GOOD_USER), _request("bad"), _request(GOOD_USER)])
+
+    assert [req.kwargs["user_id"] for req in requeued] == ["bad"]
+    assert len(written) == 2
+
+
+def test_audit_log_moves_non_uuid_user_id_to_metadata(monkeypatch):
+    published = []
+    monkeypatch.setattr(audit, "_audit_batcher", None)
+    monkeypatch.setattr(audit.audit_log_task, "apply_async", lambda kwargs, **_: published.append(kwargs))
+
+    audit.audit_log(action="subscription_updated", user_id="cus_Q1w2e3", metadata={"plan": "pro"})
+    audit.audit_log(action="login_success", user_id=GOOD_USER.upper())
+
+    stripe_event, login_event = published
+    assert stripe_event["user_id"] is None
+    assert stripe_event["metadata"] == {"plan": "pro", "raw_user_id": "cus_Q1w2e3"}
+    assert login_event["user_id"] == GOOD_USER
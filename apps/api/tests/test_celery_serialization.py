@@ -0,0 +1,52 @@
+"""
+Celery wire format: the audit and email tasks publish msgpack (audit also zstd),
+so the worker config must accept it and the payloads must survive the round trip.
+"""
+
+from kombu import compression
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from app.core.celery_app import celery_app
+from app.services.logging import audit_log_task
+from app.tasks.email import send_email_task
+
+ACCEPT = prepare_accept_content(celery_app.conf.accept_content)
+
+
+def _round_trip(payload, serializer, compressor=None):
+    content_type, encoding, body = dumps(payload, serializer=serializer)
+    if compressor:
+        body, compression_type = compression.compress(body, compressor)
+        body = compression.decompress(body, compression_type)
+    return loads(body, content_type, encoding, accept=ACCEPT)
+
+
+def test_task_serializers_are_accepted_by_workers():
+    assert audit_log_task.app is celery_app
+    for task in (audit_log_task, send_email_task):
+        assert task.serializer in celery_app.conf.accept_content
+
+
+def test_audit_event_round_trips_msgpack_zstd():
+    event = {
+        "event_id": "0b7e0c7e-3f5e-4a55-9d0e-6f1f1b1c2d3e",
+        "action": "login_success",
+        "user_id": None,
+        "metadata": {"method": "password", "tokens": 5000, "tags": ["a", "b"]},
+        "ip_address": "203.0.113.7",
+        "user_agent": "Mozilla/5.0",
+        "request_id": None,
+    }
+
+    assert _round_trip(event, "msgpack", "zstd") == event
+
+
+def test_email_kwargs_round_trip_msgpack():
+    kwargs = {
+        "to": ["user@example.com"],
+        "subject": "Welcome",
+        "html": "<p>Hi ✨</p>",
+        "metadata": {"template": "welcome"},
+    }
+
+    assert _round_trip(kwargs, "msgpack") == kwargs
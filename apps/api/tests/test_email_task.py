@@ -0,0 +1,60 @@
+"""
+Resend batch sends: every attempt for one batch carries the same Idempotency-Key,
+so a retry after a timeout on an accepted batch doesn't send the emails twice.
+HTTP, the Redis rate limiter and audit publishing are stubbed.
+"""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.tasks import email as email_task
+
+
+def _request(i):
+    return SimpleNamespace(
+        id=f"task-{i}",
+        kwargs={"to": f"user{i}@example.com", "subject": "Welcome", "html": "<p>Hi</p>"},
+        request_dict={"retries": 0},
+    )
+
+
+@pytest.fixture
+def posts(monkeypatch):
+    """Records (url, Idempotency-Key) per POST; the first batch POST times out."""
+    sent = []
+
+    def fake_post(url, json, headers):
+        sent.append((url, headers["Idempotency-Key"]))
+        if len(sent) == 1:
+            raise httpx.ReadTimeout("timed out after Resend accepted the batch")
+        return httpx.Response(
+            200,
+            json={"data": [{"id": f"msg-{i}"} for i in range(len(json))]},
+            request=httpx.Request("POST", url),
+        )
+
+    monkeypatch.setattr(email_task._http, "post", fake_post)
+    monkeypatch.setattr(email_task, "_wait_for_resend_token", lambda: None)
+    monkeypatch.setattr(email_task, "audit_log", lambda **kwargs: None)
+    monkeypatch.setattr(email_task.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(email_task, "requeue_batch", lambda task, requests: pytest.fail("re-queued"))
+    return sent
+
+
+def test_batch_retry_reuses_idempotency_key(posts):
+    requests = [_request(i) for i in range(3)]
+
+    email_task.send_email_task.run(requests)
+
+    assert [url for url, _ in posts] == [email_task.RESEND_BATCH_URL] * 2
+    first_key, retry_key = (key for _, key in posts)
+    assert first_key == retry_key == email_task._batch_idempotency_key(requests)
+
+
+def test_batch_key_depends_only_on_request_ids():
+    requests = [_request(i) for i in range(3)]
+
+    assert email_task._batch_idempotency_key(requests) == email_task._batch_idempotency_key(requests[::-1])
+    assert email_task._batch_idempotency_key(requests) != email_task._batch_idempotency_key(requests[:2])
@@ -0,0 +1,98 @@
+"""
+app_errors batch sink (services/error_log.py): queued rows are written with one
+multi-row INSERT per flush, and a full buffer drops (and counts) instead of blocking.
+The session is faked; nothing here connects to Postgres.
+"""
+
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services import error_log
+
+
+class FakeSession:
+    """Stands in for async_session_factory(): records execute() calls and commits."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+
+    async def commit(self):
+        self.calls.append(("commit", None))
+
+
+@pytest.fixture
+def db_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(error_log, "async_session_factory", lambda: FakeSession(calls))
+    return calls
+
+
+def _row(i):
+    return {"level": "frontend_error", "message": f"error {i}", "request_method": "CLIENT_SIDE"}
+
+
+async def _run_flusher_until(predicate, timeout=2.0):
+    flusher = asyncio.create_task(error_log.run_app_error_flusher())
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            assert asyncio.get_running_loop().time() < deadline, "flusher never flushed"
+            await asyncio.sleep(0.01)
+    finally:
+        await error_log.stop_app_error_flusher(flusher)
+
+
+def test_flusher_writes_queued_rows_in_one_insert(monkeypatch, db_calls):
+    async def scenario():
+        monkeypatch.setattr(error_log, "_queue", asyncio.Queue(maxsize=error_log.QUEUE_MAX_SIZE))
+        for i in range(25):
+            assert error_log.enqueue_app_error(_row(i))
+        await _run_flusher_until(lambda: ("commit", None) in db_calls)
+
+    asyncio.run(scenario())
+
+    statement, params = db_calls[0]
+    assert statement.table.name == "app_errors"
+    assert statement.is_insert
+    assert [row["message"] for row in params] == [f"error {i}" for i in range(25)]
+    assert db_calls[1:] == [("commit", None)]
+
+
+def test_full_queue_drops_and_counts(monkeypatch):
+    monkeypatch.setattr(error_log, "_queue", asyncio.Queue(maxsize=3))
+    before = REGISTRY.get_sample_value("frontend_errors_dropped_total") or 0.0
+
+    accepted = [error_log.enqueue_app_error(_row(i)) for i in range(5)]
+
+    assert accepted == [True, True, True, False, False]
+    assert REGISTRY.get_sample_value("frontend_errors_dropped_total") == before + 2
+
+
+def test_shutdown_commits_the_in_flight_batch(monkeypatch, db_calls):
+    """Stopping mid-batch must not lose rows the flusher already dequeued."""
+    async def scenario():
+        monkeypatch.setattr(error_log, "_queue", asyncio.Queue(maxsize=error_log.QUEUE_MAX_SIZE))
+        flusher = asyncio.create_task(error_log.run_app_error_flusher())
+        for i in range(3):
+            error_log.enqueue_app_error(_row(i))
+        await asyncio.sleep(0.05)  # flusher has dequeued the rows and is waiting out the interval
+        assert error_log._queue.empty()
+
+        await error_log.stop_app_error_flusher(flusher)
+        assert flusher.done() and not flusher.cancelled()
+
+    asyncio.run(scenario())
+
+    written = [row["message"] for statement, params in db_calls if not isinstance(statement, str) for row in params]
+    assert written == ["error 0", "error 1", "error 2"]
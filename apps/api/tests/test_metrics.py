@@ -0,0 +1,38 @@
+"""
+Prometheus metrics must register exactly once in the default REGISTRY: a second
+declaration (or a second module instance) raises "Duplicated timeseries" at import.
+"""
+
+import importlib
+from collections import Counter as Tally
+
+from prometheus_client import REGISTRY
+
+from app.monitoring import metrics
+
+
+def test_importing_metrics_and_middleware_twice_does_not_raise():
+    first = importlib.import_module("app.monitoring.metrics")
+    importlib.import_module("app.middleware.metrics")
+
+    assert importlib.import_module("app.monitoring.metrics") is first
+    importlib.import_module("app.middleware.metrics")
+
+
+def test_collector_names_are_unique():
+    importlib.import_module("app.middleware.metrics")
+
+    claimed = Tally(name for names in REGISTRY._collector_to_names.values() for name in names)
+    duplicates = [name for name, count in claimed.items() if count > 1]
+
+    assert duplicates == []
+    assert len(claimed) == len(REGISTRY._names_to_collectors)
+
+
+def test_every_exported_metric_owns_its_registered_names():
+    for export in metrics.__all__:
+        collector = getattr(metrics, export)
+        if collector not in REGISTRY._collector_to_names:
+            continue  # helpers / registry alias
+        for name in REGISTRY._collector_to_names[collector]:
+            assert REGISTRY._names_to_collectors[name] is collector
@@ -0,0 +1,81 @@
+"""
+Frontend error reporting: POST /monitoring/log-error must put one app_errors row
+on the batch sink's queue (services/error_log.py), with the shared rate limiter active.
+The flush itself is covered in test_error_log.py.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from limits.storage import MemoryStorage
+from limits.strategies import MovingWindowRateLimiter
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+from app.core.rate_limit import limiter
+from app.middleware.auth import get_current_user
+from app.routers import monitoring
+from app.services import error_log
+
+PAYLOAD = {
+    "message": "TypeError: x is undefined",
+    "stack": "TypeError: x is undefined\n    at Editor (editor.tsx:12)",
+    "url": "https://cursorcode.ai/projects/1",
+    "component": "Editor",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    queue = asyncio.Queue(maxsize=error_log.QUEUE_MAX_SIZE)
+    monkeypatch.setattr(error_log, "_queue", queue)
+    monkeypatch.setattr(monitoring, "audit_log", lambda **kwargs: None)
+
+    # Same limiter instance and settings (headers on), in-memory instead of Redis
+    storage = MemoryStorage()
+    monkeypatch.setattr(limiter, "enabled", True)
+    monkeypatch.setattr(limiter, "_storage", storage)
+    monkeypatch.setattr(limiter, "_limiter", MovingWindowRateLimiter(storage))
+
+    # Bare app, no lifespan: the app_errors flusher never starts
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.include_router(monitoring.router)
+    app.dependency_overrides[get_current_user] = lambda: None
+
+    with TestClient(app) as test_client:
+        yield test_client, queue
+
+
+def test_log_error_enqueues_app_error_row(client):
+    test_client, queue = client
+
+    response = test_client.post("/monitoring/log-error", json=PAYLOAD)
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "logged"}
+    assert response.headers["X-RateLimit-Limit"] == "20"
+
+    assert queue.qsize() == 1
+    row = queue.get_nowait()
+    assert row["level"] == "frontend_error"
+    assert row["message"] == "TypeError: x is undefined"
+    assert row["stack"].startswith("TypeError: x is undefined\n")
+    assert row["request_path"] == "https://cursorcode.ai/projects/1"
+    assert row["user_id"] is None
+    assert row["extra"]["component"] == "Editor"
+    # The full stack lives in its own column only
+    assert "stack" not in row["extra"]["payload"]
+
+
+def test_log_error_is_rate_limited(client):
+    test_client, queue = client
+
+    statuses = [test_client.post("/monitoring/log-error", json=PAYLOAD).status_code for _ in range(21)]
+
+    assert statuses[:20] == [200] * 20
+    assert statuses[20] == 429
+    assert queue.qsize() == 20